@@ -1,15 +1,28 @@
-from flask import Flask
+import os
+from flask import Flask, jsonify
 from flask_cors import CORS
-import threading
-from delete_temp_files import delete_temp_files
+from delete_temp_files import start_cleaner
 from routes.upload import upload_blueprint
+from routes.preflight import preflight_blueprint
+from routes.datasets import datasets_blueprint
+from routes.jobs import jobs_blueprint
+from config import MAX_UPLOAD_SIZE
 
 app = Flask(__name__)
 CORS(app)
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_SIZE + 1024 * 1024
 
 app.register_blueprint(upload_blueprint)
+app.register_blueprint(preflight_blueprint)
+app.register_blueprint(datasets_blueprint)
+app.register_blueprint(jobs_blueprint)
 
-threading.Thread(target=delete_temp_files, daemon=True).start()
+@app.route('/health', methods=['GET'])
+def health():
+    return jsonify({"status": "ok"})
 
 if __name__ == "__main__":
+    # With debug=True the reloader re-runs this module in a child process, which is the one serving
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_cleaner()
     app.run(debug=True)
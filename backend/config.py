@@ -1,4 +1,59 @@
+import os
 import tempfile
 
-TEMP_DIR = tempfile.mkdtemp()
-DELETE_INTERVAL = 3600
\ No newline at end of file
+# Exported so worker processes started with 'spawn' share the parent's directory
+TEMP_DIR = os.environ.get('PFE_TEMP_DIR') or tempfile.mkdtemp()
+os.environ['PFE_TEMP_DIR'] = TEMP_DIR
+DELETE_INTERVAL = 3600
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_SIZE = 4 * 1024 * 1024 * 1024
+
+READ_FROM_ARCHIVE = True
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'pfe_cache')
+RESULT_CACHE_DIR = os.path.join(CACHE_DIR, 'results')
+RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Bump when rule behaviour changes outside the modules hashed by scripts/result_cache.py
+RULESET_VERSION = '1'
+
+LOAD_WORKERS = 4
+
+PARSE_CACHE_ENABLED = True
+PARSE_CACHE_DIR = os.path.join(CACHE_DIR, 'layers')
+PARSE_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+EXTRACT_WORKERS = 4
+MAX_EXTRACTED_BYTES = 8 * 1024 * 1024 * 1024
+# Only members larger than MIN_RATIO_CHECK_SIZE are held to the ratio limit: padded DBFs compress very well
+MAX_COMPRESSION_RATIO = 200
+MIN_RATIO_CHECK_SIZE = 1024 * 1024
+
+# Worker processes running the CPU-bound checks; 0 runs them on the event loop
+CHECK_WORKERS = int(os.environ.get('PFE_CHECK_WORKERS', os.cpu_count() or 1))
+CHECK_POOL_START_METHOD = 'spawn'
+# Per-check deadline in seconds (None disables it); checks stop cooperatively at their next checkpoint
+CHECK_TIMEOUT = 15 * 60
+# Extra time before the scheduler stops waiting on a check that never reaches a checkpoint
+CHECK_TIMEOUT_GRACE = 30
+
+WARM_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+# Validation jobs running at once; further jobs wait in a per-submitter fair queue
+JOB_WORKERS = 4
+# Beyond these queue depths new uploads are refused with 429
+MAX_QUEUED_JOBS = 100
+MAX_QUEUED_JOBS_PER_SUBMITTER = 20
+# submitter (lower-cased email) -> share of the job slots relative to the default weight of 1
+JOB_SUBMITTER_WEIGHTS = {}
+# Finished jobs kept for status/result polling
+JOB_RETENTION = 500
+JOB_TTL = 24 * 3600
+# Job records on disk, so a status poll still gets an answer after a server restart
+JOB_STORE_DIR = os.path.join(CACHE_DIR, 'jobs')
+
+# Production server (serve.py): one process, since job admission, fair queueing and
+# warm datasets are in-process state; requests are served by threads
+SERVER_BIND = os.environ.get('PFE_BIND', '0.0.0.0:5000')
+SERVER_THREADS = 8
+SERVER_TIMEOUT = 300
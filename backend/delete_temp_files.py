@@ -1,6 +1,16 @@
 import os
 import time
-from config import TEMP_DIR, DELETE_INTERVAL
+import shutil
+import threading
+from config import TEMP_DIR, DELETE_INTERVAL, JOB_STORE_DIR, JOB_TTL
+from workspace import WORKSPACE_PREFIX
+from jobs import load_job, QUEUED, RUNNING
+
+def workspace_in_use(filename):
+    # The workspace's mtime is set at upload: a job can wait in the queue for longer than
+    # DELETE_INTERVAL. Records of jobs lost with their process expire after JOB_TTL.
+    job = load_job(filename[len(WORKSPACE_PREFIX):])
+    return job is not None and job.status in (QUEUED, RUNNING)
 
 def delete_temp_files():
     while True:
@@ -11,5 +21,24 @@ def delete_temp_files():
                 if os.path.isfile(file_path):
                     os.unlink(file_path)
                     print(f"Deleted {file_path}")
+                elif (filename.startswith(WORKSPACE_PREFIX) and not workspace_in_use(filename)
+                      and time.time() - os.path.getmtime(file_path) > DELETE_INTERVAL):
+                    shutil.rmtree(file_path)
+                    print(f"Deleted stale workspace {file_path}")
             except Exception as e:
-                print(f"Error deleting file {file_path}: {e}")
\ No newline at end of file
+                print(f"Error deleting file {file_path}: {e}")
+
+        if os.path.isdir(JOB_STORE_DIR):
+            for filename in os.listdir(JOB_STORE_DIR):
+                file_path = os.path.join(JOB_STORE_DIR, filename)
+                try:
+                    if time.time() - os.path.getmtime(file_path) > JOB_TTL:
+                        os.unlink(file_path)
+                except OSError as e:
+                    print(f"Error deleting job record {file_path}: {e}")
+
+def start_cleaner():
+    # Run it in a single process: the dev server's reloader child or the production master
+    thread = threading.Thread(target=delete_temp_files, daemon=True)
+    thread.start()
+    return thread
@@ -1,19 +1,143 @@
 import os
+import zipfile
+import posixpath
+import asyncio
+from dataclasses import dataclass, field
+
+ARCHIVE_PREFIX = '/vsizip/'
+REQUIRED_SIDECARS = ('.shx', '.dbf', '.prj')
+
+@dataclass
+class ShapefileEntry:
+    layer: str
+    path: str
+    # extension -> size in bytes, '.shp' included
+    sidecars: dict = field(default_factory=dict)
+    # extension -> path of that file
+    files: dict = field(default_factory=dict)
+
+    @property
+    def missing_sidecars(self):
+        return [extension for extension in REQUIRED_SIDECARS if extension not in self.sidecars]
+
+def archive_path(zip_path, member):
+    return f"{ARCHIVE_PREFIX}{os.path.abspath(zip_path)}/{member}"
+
+def split_archive_path(path):
+    if not path.startswith(ARCHIVE_PREFIX):
+        return None, path
+    inner = path[len(ARCHIVE_PREFIX):]
+    split_at = inner.lower().index('.zip/') + len('.zip')
+    return inner[:split_at], inner[split_at + 1:]
+
+def build_manifest(files):
+    # files: iterable of (directory, path, size), directory relative to the archive root with '/'
+    # separators; path without extension identifies a shapefile
+    groups = {}
+    for client, path, size in files:
+        stem, extension = os.path.splitext(path)
+        group = groups.setdefault((client, stem), {})
+        group[extension.lower()] = (path, size)
+
+    manifest = {}
+    for (client, stem), group in sorted(groups.items()):
+        client_layers = manifest.setdefault(client, {})
+        if '.shp' not in group:
+            continue
+        layer = os.path.basename(stem).upper()
+        if layer in client_layers:
+            print(f"Shapefile {layer} en double dans {client}, {group['.shp'][0]} est ignoré")
+            continue
+        client_layers[layer] = ShapefileEntry(
+            layer=layer,
+            path=group['.shp'][0],
+            sidecars={extension: size for extension, (_, size) in group.items()},
+            files={extension: path for extension, (path, _) in group.items()},
+        )
+    return manifest
 
 async def find_shapefiles(base_dir):
-    shapefiles = {}
-
-    async def search_directory(directory):
-        shp_files = []
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.shp'):
-                    shp_files.append(os.path.join(root, file))
-        return shp_files
-
-    for client in os.listdir(base_dir):
-        client_path = os.path.join(base_dir, client)
-        if os.path.isdir(client_path):
-            shapefiles[client] = await search_directory(client_path)
-    
-    return shapefiles
\ No newline at end of file
+    def search_directory():
+        files = []
+        for root, dirs, names in os.walk(base_dir):
+            directory = os.path.relpath(root, base_dir).replace(os.sep, '/')
+            if directory == '.':
+                continue
+            for name in names:
+                path = os.path.join(root, name)
+                files.append((directory, path, os.path.getsize(path)))
+        return build_manifest(files)
+
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, search_directory)
+
+async def find_shapefiles_in_zip(zip_path):
+    def search_archive():
+        files = []
+        with zipfile.ZipFile(zip_path, 'r') as archive:
+            for info in archive.infolist():
+                member = info.filename
+                if '/' not in member or member.startswith('__MACOSX/') or info.is_dir():
+                    continue
+                files.append((posixpath.dirname(member), archive_path(zip_path, member), info.file_size))
+        return build_manifest(files)
+
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, search_archive)
+
+def resolve_layers(manifest, layer_keys):
+    resolved = {}
+    for client in sorted(manifest):
+        for key in layer_keys:
+            if key not in resolved and key in manifest[client]:
+                resolved[key] = manifest[client][key]
+    return resolved
+
+def subtree(manifest, directory):
+    return {
+        name: layers for name, layers in manifest.items()
+        if name == directory or name.startswith(directory + '/')
+    }
+
+def parent_directories(directory):
+    parts = directory.split('/')
+    return ['/'.join(parts[:depth]) for depth in range(1, len(parts) + 1)]
+
+def delivery_units(manifest, layer_keys):
+    # A batch archive has one complete delivery per client directory, at any depth since batches
+    # are often wrapped in a root folder: each unit is the deepest directory whose subtree holds
+    # every layer. With fewer than two units, every directory is merged into a single delivery.
+    candidates = {parent for directory in manifest for parent in parent_directories(directory)}
+    complete = [
+        directory for directory in candidates
+        if layer_keys <= {key for layers in subtree(manifest, directory).values() for key in layers}
+    ]
+    units = sorted(
+        directory for directory in complete
+        if not any(other.startswith(directory + '/') for other in complete)
+    )
+    if len(units) < 2:
+        return {None: manifest}
+    grouped = {unit: subtree(manifest, unit) for unit in units}
+    # Directories outside every unit are reported as incomplete deliveries
+    grouped_directories = {directory for unit in grouped.values() for directory in unit}
+    for directory in sorted(set(manifest) - grouped_directories):
+        if layer_keys & set(manifest[directory]):
+            grouped[directory] = {directory: manifest[directory]}
+    return grouped
+
+def duplicate_layers(manifest, layer_keys):
+    # Layers found in more than one directory of a delivery, which one to validate is ambiguous
+    found = {}
+    for directory in sorted(manifest):
+        for key in sorted(layer_keys & set(manifest[directory])):
+            found.setdefault(key, []).append(manifest[directory][key].path)
+    return {key: paths for key, paths in found.items() if len(paths) > 1}
+
+def delivery_problems(entries, required):
+    missing_shapefiles = [shp for shp, key in required.items() if key not in entries]
+    incomplete_shapefiles = {
+        shp: entries[key].missing_sidecars
+        for shp, key in required.items() if key in entries and entries[key].missing_sidecars
+    }
+    return missing_shapefiles, incomplete_shapefiles
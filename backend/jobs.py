@@ -0,0 +1,197 @@
+import os
+import json
+import math
+import time
+import uuid
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from config import (
+    JOB_WORKERS, JOB_RETENTION, JOB_TTL, MAX_QUEUED_JOBS, MAX_QUEUED_JOBS_PER_SUBMITTER, JOB_SUBMITTER_WEIGHTS,
+    JOB_STORE_DIR,
+)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Assumed job duration until the first jobs have finished, used for Retry-After
+DEFAULT_JOB_DURATION = 60
+
+class JobError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+class QueueFull(JobError):
+    def __init__(self, message, retry_after):
+        super().__init__(message, 429)
+        self.retry_after = retry_after
+
+@dataclass
+class Job:
+    id: str
+    status: str = QUEUED
+    created: float = field(default_factory=time.time)
+    started: float = None
+    finished: float = None
+    result: object = None
+    error: str = None
+    status_code: int = 200
+    submitter: str = None
+
+    def to_dict(self):
+        job = {
+            "job_id": self.id,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if self.error is not None:
+            job["error"] = self.error
+        return job
+
+def _record_path(job_id):
+    return os.path.join(JOB_STORE_DIR, f"{job_id}.json")
+
+def save_job(job):
+    os.makedirs(JOB_STORE_DIR, exist_ok=True)
+    path = _record_path(job.id)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(asdict(job), f, default=str)
+    os.replace(tmp_path, path)
+
+def load_job(job_id):
+    if not job_id.isalnum():
+        return None
+    try:
+        with open(_record_path(job_id), 'r', encoding='utf-8') as f:
+            return Job(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+def delete_job(job_id):
+    try:
+        os.unlink(_record_path(job_id))
+    except OSError:
+        pass
+
+class JobManager:
+    def __init__(self, workers=JOB_WORKERS):
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        # Start-time fair queueing: each submitter has its own queue and jobs are started
+        # in order of their virtual start tag, so a burst from one submitter does not delay others.
+        self.queues = {}
+        self.finish_tags = {}
+        self.virtual_time = 0.0
+        self.running = 0
+        self.average_duration = DEFAULT_JOB_DURATION
+
+    def _add(self, job):
+        with self.lock:
+            self.jobs[job.id] = job
+            self._prune()
+        save_job(job)
+        return job
+
+    def _prune(self):
+        now = time.time()
+        finished = [job for job in self.jobs.values() if job.status in (DONE, FAILED)]
+        excess = len(finished) - JOB_RETENTION
+        for job in finished:
+            if excess > 0 or now - job.finished > JOB_TTL:
+                del self.jobs[job.id]
+                delete_job(job.id)
+                excess -= 1
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+        # Jobs pruned from memory or from before a restart are only known from their record
+        return job if job is not None else load_job(job_id)
+
+    def completed(self, result):
+        now = time.time()
+        return self._add(Job(id=uuid.uuid4().hex, status=DONE, started=now, finished=now, result=result))
+
+    def queued(self):
+        return sum(len(queue) for queue in self.queues.values())
+
+    def retry_after(self):
+        waves = self.queued() / self.workers + 1
+        return max(1, math.ceil(waves * self.average_duration))
+
+    def _admit(self, submitter):
+        if self.queued() >= MAX_QUEUED_JOBS:
+            raise QueueFull("Too many validations waiting, please retry later", self.retry_after())
+        if len(self.queues.get(submitter, ())) >= MAX_QUEUED_JOBS_PER_SUBMITTER:
+            raise QueueFull("Too many of your validations are waiting, please retry later", self.retry_after())
+
+    def submit(self, coroutine_function, *args, job_id=None, submitter=None):
+        job = Job(id=job_id or uuid.uuid4().hex, submitter=submitter)
+        # Admission, record and enqueue under one lock so concurrent uploads cannot all pass the limits
+        with self.lock:
+            self._admit(submitter)
+            self.jobs[job.id] = job
+            self._prune()
+            # Saved before dispatch so the QUEUED record never overwrites the worker's RUNNING one
+            save_job(job)
+            start = max(self.virtual_time, self.finish_tags.get(submitter, 0.0))
+            finish = start + 1 / JOB_SUBMITTER_WEIGHTS.get(submitter, 1)
+            self.finish_tags[submitter] = finish
+            self.queues.setdefault(submitter, deque()).append((start, job, coroutine_function, args))
+            self._dispatch()
+        return job
+
+    def _dispatch(self):
+        while self.running < self.workers and self.queues:
+            submitter = min(self.queues, key=lambda key: self.queues[key][0][0])
+            queue = self.queues[submitter]
+            start, job, coroutine_function, args = queue.popleft()
+            if not queue:
+                del self.queues[submitter]
+            self.virtual_time = max(self.virtual_time, start)
+            self.running += 1
+            self.executor.submit(self._run, job, coroutine_function, args)
+        if not self.queues and self.running == 0:
+            # Idle: earlier bursts no longer count against anyone
+            self.finish_tags.clear()
+        for submitter in [key for key, tag in self.finish_tags.items() if tag <= self.virtual_time and key not in self.queues]:
+            del self.finish_tags[submitter]
+
+    def _finished(self, job):
+        with self.lock:
+            self.running -= 1
+            self.average_duration = 0.8 * self.average_duration + 0.2 * (job.finished - job.started)
+            self._dispatch()
+
+    def _run(self, job, coroutine_function, args):
+        job.status = RUNNING
+        job.started = time.time()
+        save_job(job)
+        try:
+            job.result = asyncio.run(coroutine_function(*args))
+            job.status = DONE
+        except JobError as e:
+            job.error = str(e)
+            job.status_code = e.status_code
+            job.status = FAILED
+        except Exception as e:
+            print(f"Erreur lors de l'exécution du job {job.id} : {e}")
+            job.error = "Internal error during validation"
+            job.status_code = 500
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            save_job(job)
+            self._finished(job)
+
+jobs = JobManager()
@@ -0,0 +1,30 @@
+from flask import Blueprint, request, jsonify
+from scripts.checks import select_checks, loaded_columns
+from scripts.scheduler import run_checks
+from scripts.check_pool import check_executor
+from scripts.dataset_cache import warm_datasets, missing_columns, refresh_dataset_size
+
+datasets_blueprint = Blueprint('datasets', __name__)
+
+@datasets_blueprint.route('/datasets/<dataset_id>/checks', methods=['POST'])
+async def run_dataset_checks(dataset_id):
+    dataset = warm_datasets.get(dataset_id)
+    if dataset is None:
+        return jsonify({"error": "Unknown or expired dataset, please upload the archive again"}), 404
+
+    check_ids = [check_id.strip() for check_id in request.form.get('checks', '').split(',') if check_id.strip()]
+    if not check_ids:
+        return jsonify({"error": "Missing checks part"}), 400
+    try:
+        checks = select_checks(dataset.choice, check_ids)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    missing = missing_columns(dataset, loaded_columns(checks))
+    if missing:
+        return jsonify({"error": f"Dataset was loaded without the columns needed by these checks: {missing}"}), 409
+
+    report = await run_checks(checks, dataset.layers, dataset.choice, check_executor(), dataset.products)
+    refresh_dataset_size(dataset)
+    report["dataset_id"] = dataset.id
+    return jsonify(report)
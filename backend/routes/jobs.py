@@ -0,0 +1,22 @@
+from flask import Blueprint, jsonify
+from jobs import jobs, DONE, FAILED
+
+jobs_blueprint = Blueprint('jobs', __name__)
+
+@jobs_blueprint.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.to_dict())
+
+@jobs_blueprint.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    if job.status == DONE:
+        return jsonify(job.result)
+    if job.status == FAILED:
+        return jsonify({"error": job.error}), job.status_code
+    return jsonify(job.to_dict()), 202
@@ -0,0 +1,85 @@
+from flask import Blueprint, request, jsonify
+import asyncio
+import zipfile
+from werkzeug.utils import secure_filename
+from scripts.save_upload import save_upload, UploadTooLarge
+from scripts.layers import required_shapefiles, manifest_key
+from scripts.checks import select_checks, required_columns
+from scripts.shapefile_headers import read_headers
+from scripts.scheduler import plan_checks
+from find_shapefiles import find_shapefiles_in_zip, resolve_layers, delivery_problems
+from workspace import job_workspace
+
+preflight_blueprint = Blueprint('preflight', __name__)
+
+@preflight_blueprint.route('/preflight', methods=['POST'])
+async def preflight():
+    if 'file' not in request.files or 'choice' not in request.form:
+        return jsonify({"error": "Missing file or choice part"}), 400
+
+    file = request.files['file']
+    choice = request.form['choice']
+
+    if file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+
+    if not file.filename.endswith('.zip'):
+        return jsonify({"error": "Please upload a ZIP file"}), 400
+
+    if choice not in ('di', 'tr'):
+        return jsonify({"error": "Invalid choice"}), 400
+
+    check_ids = [check_id.strip() for check_id in request.form.get('checks', '').split(',') if check_id.strip()]
+    try:
+        checks = select_checks(choice, check_ids)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    async with job_workspace() as workspace:
+        zip_path = workspace.file_path(secure_filename(file.filename) or 'upload.zip')
+        try:
+            await save_upload(file, zip_path)
+        except UploadTooLarge as e:
+            return jsonify({"error": str(e)}), 413
+
+        required = {shp: manifest_key(shp) for shp in required_shapefiles(choice).values()}
+        try:
+            manifest = await find_shapefiles_in_zip(zip_path)
+            entries = resolve_layers(manifest, set(required.values()))
+            loop = asyncio.get_event_loop()
+            headers = await loop.run_in_executor(None, read_headers, entries, zip_path)
+        except zipfile.BadZipFile as e:
+            return jsonify({"error": f"Invalid ZIP file: {e}"}), 400
+
+    missing_shapefiles, incomplete_shapefiles = delivery_problems(entries, required)
+    expected_columns = required_columns(checks)
+
+    layers = {}
+    schema_errors = {}
+    counts = {}
+    for layer, shp in required_shapefiles(choice).items():
+        key = manifest_key(shp)
+        if key not in headers:
+            continue
+        layer_headers = headers[key]
+        counts[layer] = layer_headers.get('feature_count', 0)
+        if 'error' not in layer_headers:
+            missing_columns = sorted(set(expected_columns.get(layer, ())) - set(layer_headers['fields']))
+            layer_headers['missing_columns'] = missing_columns
+            if missing_columns:
+                schema_errors[shp] = missing_columns
+        layers[shp] = layer_headers
+
+    unreadable = {shp: layer_headers['error'] for shp, layer_headers in layers.items() if 'error' in layer_headers}
+    no_crs = [shp for shp, layer_headers in layers.items() if 'error' not in layer_headers and not layer_headers['crs']]
+
+    return jsonify({
+        "ok": not (missing_shapefiles or incomplete_shapefiles or schema_errors or unreadable or no_crs),
+        "missing_shapefiles": missing_shapefiles,
+        "incomplete_shapefiles": incomplete_shapefiles,
+        "missing_columns": schema_errors,
+        "unreadable_shapefiles": unreadable,
+        "missing_crs": no_crs,
+        "layers": layers,
+        "plan": plan_checks(checks, counts),
+    })
@@ -0,0 +1,80 @@
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from config import CHECK_WORKERS, CHECK_POOL_START_METHOD
+
+_check_executor = None
+_started_queue = None
+_lock = threading.Lock()
+# Parent side: callbacks waiting for a worker to pick their task up
+_start_callbacks = {}
+# Worker side: queue the worker reports picked up tasks on
+_started = None
+
+def _init_worker(started):
+    global _started
+    _started = started
+    # Pay the geospatial import cost once per worker instead of on the first check
+    import geopandas
+    import shapely
+    import pyproj
+    import scripts.scheduler
+    from scripts.shared_layers import start_release_watcher
+    start_release_watcher()
+
+def task_started(task_id):
+    if _started is not None and task_id is not None:
+        _started.put(task_id)
+
+def on_task_start(task_id, callback):
+    # Register before submitting the task, the worker may pick it up right away
+    with _lock:
+        _start_callbacks[task_id] = callback
+
+def forget_task(task_id):
+    with _lock:
+        _start_callbacks.pop(task_id, None)
+
+def _listen(started):
+    while True:
+        task_id = started.get()
+        if task_id is None:
+            return
+        with _lock:
+            callback = _start_callbacks.pop(task_id, None)
+        if callback is None:
+            continue
+        try:
+            callback()
+        except RuntimeError:
+            # The job's event loop closed in the meantime
+            pass
+
+def _discard_broken_pool():
+    # A worker killed by the OOM killer or a GEOS crash breaks the whole pool: every later
+    # submit would raise BrokenProcessPool, so the next job gets a fresh pool instead
+    global _check_executor, _started_queue
+    _check_executor.shutdown(wait=False, cancel_futures=True)
+    _started_queue.put(None)
+    _check_executor = None
+    _started_queue = None
+
+def check_executor():
+    global _check_executor, _started_queue
+    if CHECK_WORKERS <= 0:
+        return None
+    with _lock:
+        if _check_executor is not None and _check_executor._broken:
+            print("Pool de vérification interrompu, redémarrage des workers")
+            _discard_broken_pool()
+        if _check_executor is None:
+            context = multiprocessing.get_context(CHECK_POOL_START_METHOD)
+            started = _started_queue = context.Queue()
+            _check_executor = ProcessPoolExecutor(
+                max_workers=CHECK_WORKERS,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(started,),
+            )
+            threading.Thread(target=_listen, args=(started,), daemon=True).start()
+    return _check_executor
@@ -0,0 +1,357 @@
+import math
+from dataclasses import dataclass, field
+from scripts.products import aligned, sindex, nodes
+from scripts.node_index import NODE_LAYERS
+from scripts.zone_hierarchy import verify_zone_hierarchy
+from scripts.verify import (
+    verify_geometries_in_zones, check_zp_intersections, verify_zsro_in_zonenro,
+    detect_self_intersections_c, verify_c_intersections, verify_mic_pm, detect_cb_without_cm,
+    check_duplicates, verify_cable_direction,
+    verify_nd_code, verify_nd_r3_code, verify_zn_nd_code, verify_zn_r1_code, verify_zn_r2_code,
+    verify_zn_r3_code, verify_zn_nroref, verify_pcn_cb_ent_sro, verify_nd_r4_code, verify_zs_code,
+    verify_zs_nd_code, verify_zs_zn_code, verify_zs_r1_code, verify_zs_r2_code, verify_zs_r3_code,
+    verify_zs_r4_code, verify_zs_refpm, verify_zs_capamax, verify_pcn_ftte_zsro, verify_pcn_umtot_zsro,
+    verify_pcn_ftth,
+)
+from scripts.verify_di import (
+    verify_cb_capafo, verify_mic_pa, verify_long_connections, verify_length_D1, verify_no_overlap,
+    verify_max_distance_between_supports,
+    verify_PBR_EL, singleEL,
+    verify_pcn_code_zpa, verify_pcn_capa_zpa, verify_pcn_ftth_zpa, verify_pcn_umftth_zpa, verify_pcn_ftte_zpa,
+    verify_pcn_umftte_zpa, verify_pcn_umuti_zpa, verify_pcn_umrsv_zpa, verify_pcn_umtot_zpa, verify_pcn_sro,
+    verify_pcn_code_pa, verify_pcn_cb_ent_pa, verify_pcn_code_pb, verify_PB_pcn_pbtyp, verify_PB_pcn_umftth,
+    verify_pcn_zpa, verify_pcn_cb_ent_pb, verify_pcn_commen_pb, verify_pcn_rac_lg_pb, verify_pcn_code_zpbo,
+    verify_zp_r4_code, verify_pcn_zpa_zpbo,
+)
+
+DI = 'di'
+TR = 'tr'
+
+@dataclass
+class Check:
+    id: str
+    modes: tuple
+    # layer -> attribute columns read by the check (geometry is always loaded)
+    layers: dict
+    # run(layers, choice) may return a coroutine or, for the attribute checks, the result itself
+    run: object
+    outputs: tuple
+    # shared intermediates (see scripts.products) computed once per job, before the check runs
+    products: tuple = ()
+    # opt-in checks only run when requested by id
+    default: bool = True
+    # cost(counts) predicts the work from the feature count of each layer; None means linear
+    cost: object = None
+    # topology checks read geometries and are skipped when a blocking rule fails on one of their layers
+    topology: bool = False
+    # deadline in seconds overriding CHECK_TIMEOUT
+    timeout: object = None
+    # layer -> columns read only when the delivery has them: loaded, but not required by the gates
+    optional: dict = field(default_factory=dict)
+
+def linear(*layers):
+    return lambda counts: sum(counts.get(layer, 0) for layer in layers)
+
+def indexed(*layers):
+    return lambda counts: sum(counts.get(layer, 0) * math.log2(counts.get(layer, 0) + 2) for layer in layers)
+
+def pairwise(left, *rights):
+    return lambda counts: counts.get(left, 0) * sum(counts.get(right, 0) for right in rights)
+
+def combined(*costs):
+    return lambda counts: sum(cost(counts) for cost in costs)
+
+NODE_COLUMNS = {layer: [] for layer in NODE_LAYERS}
+
+# check_duplicates skips a code column the layer does not have
+DUPLICATE_COLUMNS = {
+    'CB': ['cl_codeext'], 'CM': ['cm_codeext'], 'PB': ['pcn_code'], 'ADRESSE': ['ad_code'],
+    'NRO': ['nd_code'], 'PA': ['pcn_code'], 'PEP': ['pcn_code'], 'SRO': ['nd_code'],
+    'SUPPORT': ['pt_codeext', 'pcn_id'], 'ZNRO': ['zn_code'], 'ZPA': ['pcn_code'],
+    'ZPBO': ['pcn_code'], 'ZSRO': ['zs_code'],
+}
+
+def duplicate_frames(layers, choice):
+    return [
+        (f"CB_{choice.upper()}", layers['CB']),
+        (f"CM_{choice.upper()}", layers['CM']),
+        ("PB", layers['PB']),
+        ("ADRESSE", layers['ADRESSE']),
+        ("NRO", layers['NRO']),
+        ("PA", layers['PA']),
+        ("PEP", layers['PEP']),
+        ("SRO", layers['SRO']),
+        ("SUPPORT", layers['SUPPORT']),
+        ("ZNRO", layers['ZNRO']),
+        ("ZPA", layers['ZPA']),
+        ("ZPBO", layers['ZPBO']),
+        ("ZSRO", layers['ZSRO']),
+    ]
+
+CHECKS = [
+    Check('PBR_EL', (DI,), {'PB': ['pcn_pbtyp', 'pcn_ftth', 'pcn_code']},
+          lambda layers, choice: verify_PBR_EL(layers['PB']),
+          ("Invalid PBR EL",)),
+    Check('cb_capafo', (DI,), {'CB': ['cb_capafo', 'cl_codeext'], 'SUPPORT': ['pcn_newsup']},
+          lambda layers, choice: verify_cb_capafo(layers['CB'], layers['SUPPORT']),
+          ("invalid_cb_capafo",), cost=pairwise('CB', 'SUPPORT'), topology=True),
+    Check('duplicates', (DI, TR), {layer: [] for layer in DUPLICATE_COLUMNS},
+          lambda layers, choice: check_duplicates(duplicate_frames(layers, choice)),
+          ("invalid_duplicates",), optional=DUPLICATE_COLUMNS),
+    Check('singleEL', (DI,), {'PB': ['pcn_ftth', 'pcn_code']},
+          lambda layers, choice: singleEL(layers['PB']),
+          ("invalid_singleEL",)),
+    Check('mic_pm', (DI, TR), {'ZSRO': ['pcn_umtot']},
+          lambda layers, choice: verify_mic_pm(layers['ZSRO']),
+          ("invalid_mic_pm",)),
+    Check('mic_pa', (DI,), {'ZPA': ['pcn_umftth', 'pcn_code']},
+          lambda layers, choice: verify_mic_pa(layers['ZPA']),
+          ("invalid_mic_pa",)),
+    Check('long_connections', (DI,), {'CM': ['cm_long', 'cm_typelog', 'cm_codeext']},
+          lambda layers, choice: verify_long_connections(layers['CM']),
+          ("invalid_long_connections",)),
+    Check('length_D1', (DI,), {'CB': ['cl_codeext', 'cb_long']},
+          lambda layers, choice: verify_length_D1(layers['CB']),
+          ("invalid_length_D1",)),
+    Check('no_overlap', (DI,), {'PA': ['pcn_code'], 'SUPPORT': ['pt_prop']},
+          lambda layers, choice: verify_no_overlap(layers['PA'], layers['SUPPORT']),
+          ("invalid_no_overlap",), cost=indexed('PA', 'SUPPORT'), topology=True),
+    Check('cb_intersections', (DI, TR), {**NODE_COLUMNS, 'CB': ['cl_codeext']},
+          lambda layers, choice: verify_c_intersections(layers['CB'], layers[nodes('CB')], 'CB'),
+          ("invalid_cb_intersections",), (sindex('CB'), nodes('CB')),
+          cost=indexed('CB', *NODE_LAYERS), topology=True),
+    Check('cm_intersections', (DI, TR), {**NODE_COLUMNS, 'CM': ['cm_codeext']},
+          lambda layers, choice: verify_c_intersections(layers['CM'], layers[nodes('CM')], 'CM'),
+          ("invalid_cm_intersections",), (sindex('CM'), nodes('CM')),
+          cost=indexed('CM', *NODE_LAYERS), topology=True),
+    Check('self_intersections_cb', (DI, TR), {'CB': ['cl_codeext']},
+          lambda layers, choice: detect_self_intersections_c(layers['CB'], 'CB'),
+          ("invalid_self_intersections_cb",), topology=True),
+    Check('self_intersections_cm', (DI, TR), {'CM': ['cm_codeext']},
+          lambda layers, choice: detect_self_intersections_c(layers['CM'], 'CM'),
+          ("invalid_self_intersections_cm",), topology=True),
+    Check('zones_pa', (DI,), {'PA': ['pcn_code'], 'ZPA': ['pcn_code']},
+          lambda layers, choice: verify_geometries_in_zones(layers[aligned('PA', 'ZPA')], layers['ZPA'], 'PA'),
+          ("Not in zones PA", "ND code mismatch PA"), (aligned('PA', 'ZPA'),), topology=True),
+    Check('zones_pb', (DI,), {'PB': ['pcn_code'], 'ZPBO': ['pcn_code']},
+          lambda layers, choice: verify_geometries_in_zones(layers[aligned('PB', 'ZPBO')], layers['ZPBO'], 'PB'),
+          ("Not in zones PB", "ND code mismatch PB"), (aligned('PB', 'ZPBO'),), topology=True),
+    Check('zones_sro', (DI, TR), {'SRO': ['nd_code'], 'ZSRO': ['zs_code', 'zs_nd_code']},
+          lambda layers, choice: verify_geometries_in_zones(layers[aligned('SRO', 'ZSRO')], layers['ZSRO'], 'SRO'),
+          ("Not in zones SRO", "ND code mismatch SRO"), (aligned('SRO', 'ZSRO'),),
+          cost=linear('SRO', 'ZSRO'), topology=True),
+    Check('zones_nro', (DI, TR), {'NRO': ['nd_code'], 'ZNRO': ['zn_code', 'zn_nd_code']},
+          lambda layers, choice: verify_geometries_in_zones(layers[aligned('NRO', 'ZNRO')], layers['ZNRO'], 'NRO'),
+          ("Not in zones NRO", "ND code mismatch NRO"), (aligned('NRO', 'ZNRO'),),
+          cost=linear('NRO', 'ZNRO'), topology=True),
+    Check('max_distance_between_supports', (DI,), {'CM': [], 'SUPPORT': ['pcn_newsup', 'pt_codeext']},
+          lambda layers, choice: verify_max_distance_between_supports(layers['CM'], layers[aligned('SUPPORT', 'CM')]),
+          ("invalid_max_distance_between_supports",), (aligned('SUPPORT', 'CM'),),
+          cost=pairwise('CM', 'SUPPORT'), topology=True),
+    Check('zone_hierarchy', (DI,), {
+              'ZPBO': ['pcn_code', 'pcn_zpa'], 'ZPA': ['pcn_code', 'pcn_sro'],
+              'ZSRO': ['zs_code', 'zs_r4_code', 'zs_r3_code'], 'ZNRO': ['zn_r3_code'],
+          },
+          lambda layers, choice: verify_zone_hierarchy(
+              {layer: layers[aligned(layer, 'ZSRO')] for layer in ('ZPBO', 'ZPA', 'ZNRO')} | {'ZSRO': layers['ZSRO']}),
+          ("invalid_zpb_in_zonepa", "invalid_zpa_in_zonesro", "invalid_zsro_in_zonenro"),
+          tuple(aligned(layer, 'ZSRO') for layer in ('ZPBO', 'ZPA', 'ZNRO')),
+          cost=linear('ZPBO', 'ZPA', 'ZSRO', 'ZNRO'), topology=True),
+    Check('zsro_in_zonenro', (TR,), {'ZSRO': ['zs_code', 'zs_r3_code'], 'ZNRO': ['zn_r3_code']},
+          lambda layers, choice: verify_zsro_in_zonenro(layers[aligned('ZSRO', 'ZNRO')], layers['ZNRO']),
+          ("invalid_zsro_in_zonenro",), (aligned('ZSRO', 'ZNRO'),), cost=linear('ZSRO', 'ZNRO'), topology=True),
+    Check('zpbo_intersections', (DI,), {'ZPBO': ['pcn_code']},
+          lambda layers, choice: check_zp_intersections(layers['ZPBO'], 'PB'),
+          ("invalid_zpbo_intersections",), (sindex('ZPBO'),), cost=indexed('ZPBO'), topology=True),
+    Check('zpa_intersections', (DI,), {'ZPA': ['pcn_code']},
+          lambda layers, choice: check_zp_intersections(layers['ZPA'], 'PA'),
+          ("invalid_zpa_intersections",), (sindex('ZPA'),), cost=indexed('ZPA'), topology=True),
+    Check('zsro_intersections', (TR,), {'ZSRO': ['zs_code']},
+          lambda layers, choice: check_zp_intersections(layers['ZSRO'], 'SRO'),
+          ("invalid_zsro_intersections",), (sindex('ZSRO'),), cost=indexed('ZSRO'), topology=True),
+    Check('cb_without_cm', (DI, TR), {**NODE_COLUMNS, 'CB': ['cl_codeext'], 'CM': []},
+          lambda layers, choice: detect_cb_without_cm(layers['CB'], layers[aligned('CM', 'CB')], layers[nodes('CB')]),
+          ("invalid_cb_without_cm",), (aligned('CM', 'CB'), nodes('CB')),
+          cost=indexed('CB', 'CM', *NODE_LAYERS), topology=True),
+    Check('cable_direction', (DI, TR), {**NODE_COLUMNS, 'CB': ['cl_codeext']},
+          lambda layers, choice: verify_cable_direction(layers['CB'], layers[nodes('CB')]),
+          ("incorrect_direction_cables",), (nodes('CB'),),
+          cost=indexed('CB', *NODE_LAYERS), topology=True),
+]
+
+# Attribute table checks, off by default: select them by id through the 'checks' field
+ATTRIBUTE_CHECKS = [
+    Check('nd_code_nro', (DI, TR), {'NRO': ['nd_code']},
+          lambda layers, choice: verify_nd_code(layers['NRO'], 'NRO'),
+          ("invalid_nd_code",), default=False),
+    Check('nd_code_sro', (DI, TR), {'SRO': ['nd_code']},
+          lambda layers, choice: verify_nd_code(layers['SRO'], 'SRO'),
+          ("invalid_nd_code_sro",), default=False),
+    Check('nd_r3_code', (DI, TR), {'NRO': ['nd_r3_code']},
+          lambda layers, choice: verify_nd_r3_code(layers['NRO']),
+          ("invalid_nd_r3_code",), default=False),
+    Check('zn_nd_code', (DI, TR), {'ZNRO': ['zn_nd_code'], 'NRO': ['nd_code']},
+          lambda layers, choice: verify_zn_nd_code(layers['ZNRO'], layers['NRO']),
+          ("invalid_zn_nd_code",), default=False),
+    Check('zn_r1_code', (DI, TR), {'ZNRO': ['zn_r1_code']},
+          lambda layers, choice: verify_zn_r1_code(layers['ZNRO']),
+          ("invalid_zn_r1_code",), default=False),
+    Check('zn_r2_code', (DI, TR), {'ZNRO': ['zn_r2_code']},
+          lambda layers, choice: verify_zn_r2_code(layers['ZNRO']),
+          ("invalid_zn_r2_code",), default=False),
+    Check('zn_r3_code', (DI, TR), {'ZNRO': ['zn_r3_code'], 'NRO': ['nd_r3_code']},
+          lambda layers, choice: verify_zn_r3_code(layers['ZNRO'], layers['NRO']),
+          ("invalid_zn_r3_code",), default=False),
+    Check('zn_nroref', (DI, TR), {'ZNRO': ['zn_nroref']},
+          lambda layers, choice: verify_zn_nroref(layers['ZNRO']),
+          ("invalid_zn_nroref",), default=False),
+    Check('pcn_cb_ent_sro', (DI, TR), {'SRO': ['pcn_cb_ent', 'nd_code'], 'ADRESSE': ['pcn_ftth']},
+          lambda layers, choice: verify_pcn_cb_ent_sro(layers['SRO'], layers['ADRESSE']),
+          ("invalid_pcn_cb_ent_sro",), default=False),
+    Check('nd_r4_code', (DI, TR), {'SRO': ['nd_r4_code']},
+          lambda layers, choice: verify_nd_r4_code(layers['SRO']),
+          ("invalid_nd_r4_code",), default=False),
+    Check('zs_code', (DI, TR), {'ZSRO': ['zs_code']},
+          lambda layers, choice: verify_zs_code(layers['ZSRO']),
+          ("invalid_zs_code",), default=False),
+    Check('zs_nd_code', (DI, TR), {'ZSRO': ['zs_nd_code'], 'SRO': ['nd_code']},
+          lambda layers, choice: verify_zs_nd_code(layers['ZSRO'], layers['SRO']),
+          ("invalid_zs_nd_code",), default=False),
+    Check('zs_zn_code', (DI, TR), {'ZSRO': ['zs_zn_code'], 'ZNRO': ['zn_code']},
+          lambda layers, choice: verify_zs_zn_code(layers['ZSRO'], layers['ZNRO']),
+          ("invalid_zs_zn_code",), default=False),
+    Check('zs_r1_code', (DI, TR), {'ZSRO': ['zs_r1_code'], 'ZNRO': ['zn_r1_code']},
+          lambda layers, choice: verify_zs_r1_code(layers['ZSRO'], layers['ZNRO']),
+          ("invalid_zs_r1_code",), default=False),
+    Check('zs_r2_code', (DI, TR), {'ZSRO': ['zs_r2_code'], 'ZNRO': ['zn_r2_code']},
+          lambda layers, choice: verify_zs_r2_code(layers['ZSRO'], layers['ZNRO']),
+          ("invalid_zs_r2_code",), default=False),
+    Check('zs_r3_code', (DI, TR), {'ZSRO': ['zs_r3_code'], 'ZNRO': ['zn_r3_code']},
+          lambda layers, choice: verify_zs_r3_code(layers['ZSRO'], layers['ZNRO']),
+          ("invalid_zs_r3_code",), default=False),
+    Check('zs_r4_code', (DI, TR), {'ZSRO': ['zs_r4_code'], 'SRO': ['nd_r4_code']},
+          lambda layers, choice: verify_zs_r4_code(layers['ZSRO'], layers['SRO']),
+          ("invalid_zs_r4_code",), default=False),
+    Check('zs_refpm', (DI, TR), {'ZSRO': ['zs_refpm']},
+          lambda layers, choice: verify_zs_refpm(layers['ZSRO']),
+          ("invalid_zs_refpm",), default=False),
+    Check('zs_capamax', (DI, TR), {'ZSRO': ['zs_capamax', 'zs_r4_code']},
+          lambda layers, choice: verify_zs_capamax(layers['ZSRO']),
+          ("invalid_zs_capamax",), default=False),
+    Check('pcn_ftte_zsro', (DI, TR), {'ZSRO': ['pcn_ftte', 'zs_code'], 'ADRESSE': ['pcn_ftte']},
+          lambda layers, choice: verify_pcn_ftte_zsro(layers['ZSRO'], layers['ADRESSE']),
+          ("invalid_pcn_ftte_zsro",), default=False, cost=pairwise('ZSRO', 'ADRESSE'), topology=True),
+    Check('pcn_umtot_zsro', (DI, TR), {'ZSRO': ['pcn_umtot', 'zs_code'], 'PB': ['pcn_umftth']},
+          lambda layers, choice: verify_pcn_umtot_zsro(layers['ZSRO'], layers['PB']),
+          ("invalid_pcn_umtot_zsro",), default=False, cost=pairwise('ZSRO', 'PB'), topology=True),
+    Check('pcn_code_zpa', (DI, TR), {'ZPA': ['pcn_code']},
+          lambda layers, choice: verify_pcn_code_zpa(layers['ZPA']),
+          ("invalid_pcn_code_zpa",), default=False),
+    Check('pcn_capa_zpa', (DI, TR), {'ZPA': ['pcn_capa', 'pcn_code'], 'CB': ['cb_capafo']},
+          lambda layers, choice: verify_pcn_capa_zpa(layers['ZPA'], layers['CB']),
+          ("invalid_pcn_capa_zpa",), default=False, cost=pairwise('ZPA', 'CB'), topology=True),
+    Check('pcn_ftth_zpa', (DI, TR), {'ZPA': ['pcn_ftth', 'pcn_code'], 'ADRESSE': ['pcn_ftth']},
+          lambda layers, choice: verify_pcn_ftth_zpa(layers['ZPA'], layers['ADRESSE']),
+          ("invalid_pcn_ftth_zpa",), default=False, cost=pairwise('ZPA', 'ADRESSE'), topology=True),
+    Check('pcn_umftth_zpa', (DI, TR), {'ZPA': ['pcn_umftth', 'pcn_code'], 'PB': ['pcn_umftth']},
+          lambda layers, choice: verify_pcn_umftth_zpa(layers['ZPA'], layers['PB']),
+          ("invalid_pcn_umftth_zpa",), default=False, cost=pairwise('ZPA', 'PB'), topology=True),
+    Check('pcn_ftte_zpa', (DI, TR), {'ZPA': ['pcn_ftte', 'pcn_code'], 'ADRESSE': ['pcn_ftte']},
+          lambda layers, choice: verify_pcn_ftte_zpa(layers['ZPA'], layers['ADRESSE']),
+          ("invalid_pcn_ftte_zpa",), default=False, cost=pairwise('ZPA', 'ADRESSE'), topology=True),
+    Check('pcn_umftte_zpa', (DI, TR), {'ZPA': ['pcn_umftte', 'pcn_code'], 'PB': ['pcn_umftte']},
+          lambda layers, choice: verify_pcn_umftte_zpa(layers['ZPA'], layers['PB']),
+          ("invalid_pcn_umftte_zpa",), default=False, cost=pairwise('ZPA', 'PB'), topology=True),
+    Check('pcn_umuti_zpa', (DI, TR), {'ZPA': ['pcn_umuti', 'pcn_code', 'pcn_umftth', 'pcn_umftte']},
+          lambda layers, choice: verify_pcn_umuti_zpa(layers['ZPA']),
+          ("invalid_pcn_umuti_zpa",), default=False),
+    Check('pcn_umrsv_zpa', (DI, TR), {'ZPA': ['pcn_umrsv', 'pcn_code', 'pcn_capa', 'pcn_umuti']},
+          lambda layers, choice: verify_pcn_umrsv_zpa(layers['ZPA']),
+          ("invalid_pcn_umrsv_zpa",), default=False),
+    Check('pcn_umtot_zpa', (DI, TR), {'ZPA': ['pcn_umtot', 'pcn_code', 'pcn_umuti', 'pcn_umrsv']},
+          lambda layers, choice: verify_pcn_umtot_zpa(layers['ZPA']),
+          ("invalid_pcn_umtot_zpa",), default=False),
+    Check('pcn_sro_zpa', (DI, TR), {'ZPA': ['pcn_sro'], 'ZSRO': ['zs_r4_code']},
+          lambda layers, choice: verify_pcn_sro(layers['ZPA'], layers['ZSRO'], 'ZPA'),
+          ("invalid_pcn_sro_zpa",), default=False),
+    Check('pcn_sro_pa', (DI, TR), {'PA': ['pcn_sro'], 'ZSRO': ['zs_r4_code']},
+          lambda layers, choice: verify_pcn_sro(layers['PA'], layers['ZSRO'], 'PA'),
+          ("invalid_pcn_sro_pa",), default=False),
+    Check('pcn_code_pa', (DI, TR), {'PA': ['pcn_code'], 'ZPA': ['pcn_code']},
+          lambda layers, choice: verify_pcn_code_pa(layers['PA'], layers['ZPA']),
+          ("invalid_pcn_code_pa",), default=False, cost=pairwise('PA', 'ZPA'), topology=True),
+    Check('pcn_cb_ent_pa', (DI, TR), {'PA': ['pcn_cb_ent', 'pcn_code'], 'CB': ['cb_capafo']},
+          lambda layers, choice: verify_pcn_cb_ent_pa(layers['PA'], layers['CB']),
+          ("invalid_pcn_cb_ent_pa",), default=False, cost=pairwise('PA', 'CB'), topology=True),
+    Check('pcn_code_pb', (DI, TR), {'PB': ['pcn_code']},
+          lambda layers, choice: verify_pcn_code_pb(layers['PB']),
+          ("invalid_pcn_code_pb",), default=False),
+    Check('PB_pcn_pbtyp', (DI, TR), {'PB': ['pcn_pbtyp', 'pcn_code']},
+          lambda layers, choice: verify_PB_pcn_pbtyp(layers['PB']),
+          ("invalid_PB_pcn_pbtyp",), default=False),
+    Check('pcn_ftth', (DI, TR), {
+              'ZPA': ['pcn_ftth', 'pcn_code'], 'PB': ['pcn_ftth', 'pcn_code'], 'ZPBO': ['pcn_ftth', 'pcn_code'],
+              'ZSRO': ['pcn_ftth', 'pcn_code'], 'ADRESSE': ['pcn_ftth'],
+          },
+          lambda layers, choice: verify_pcn_ftth(
+              layers['ZPA'], layers['PB'], layers['ZPBO'], layers['ZSRO'], layers['ADRESSE']),
+          ("invalid_pcn_ftth",), default=False, cost=pairwise('ADRESSE', 'ZPA', 'PB', 'ZPBO', 'ZSRO'), topology=True),
+    Check('PB_pcn_umftth', (DI, TR), {'PB': ['pcn_pbtyp', 'pcn_umftth', 'pcn_code', 'pcn_ftth']},
+          lambda layers, choice: verify_PB_pcn_umftth(layers['PB']),
+          ("Invalid_PB_pcn_umftth",), default=False),
+    Check('pcn_sro_pb', (DI, TR), {'PB': ['pcn_sro'], 'ZSRO': ['zs_r4_code']},
+          lambda layers, choice: verify_pcn_sro(layers['PB'], layers['ZSRO'], 'PB'),
+          ("invalid_pcn_sro_pb",), default=False),
+    Check('pcn_zpa', (DI, TR), {'PB': ['pcn_zpa', 'pcn_code'], 'ZPA': ['pcn_code']},
+          lambda layers, choice: verify_pcn_zpa(layers['PB'], layers['ZPA']),
+          ("invalid_pcn_zpa",), default=False, cost=pairwise('PB', 'ZPA'), topology=True),
+    Check('pcn_cb_ent_pb', (DI, TR), {'PB': ['pcn_pbtyp', 'pcn_ftth', 'pcn_cb_ent', 'pcn_code']},
+          lambda layers, choice: verify_pcn_cb_ent_pb(layers['PB']),
+          ("invalid_pcn_cb_ent_pb",), default=False),
+    Check('pcn_commen_pb', (DI, TR), {'PB': ['pcn_commen', 'pcn_code', 'pcn_pbtyp']},
+          lambda layers, choice: verify_pcn_commen_pb(layers['PB']),
+          ("invalid_pcn_commen_pb",), default=False),
+    Check('pcn_rac_lg_pb', (DI, TR), {'PB': ['pcn_rac_lg', 'pcn_code'], 'CB': ['cb_long', 'cb_typelog']},
+          lambda layers, choice: verify_pcn_rac_lg_pb(layers['PB'], layers['CB']),
+          ("invalid_pcn_rac_lg_pb",), default=False, cost=pairwise('PB', 'CB'), topology=True),
+    Check('pcn_code_zpbo', (DI, TR), {'ZPBO': ['pcn_code'], 'PB': ['pcn_code']},
+          lambda layers, choice: verify_pcn_code_zpbo(layers['ZPBO'], layers['PB']),
+          ("invalid_pcn_code_zpbo",), default=False, cost=pairwise('ZPBO', 'PB'), topology=True),
+    Check('zp_r4_code', (DI, TR), {'ZPBO': ['zp_r4_code'], 'ZSRO': ['zs_r4_code']},
+          lambda layers, choice: verify_zp_r4_code(layers['ZPBO'], layers['ZSRO']),
+          ("invalid_zp_r4_code",), default=False),
+    Check('pcn_zpa_zpbo', (DI, TR), {'ZPBO': ['pcn_zpa', 'pcn_code'], 'ZPA': ['pcn_code']},
+          lambda layers, choice: verify_pcn_zpa_zpbo(layers['ZPBO'], layers['ZPA']),
+          ("invalid_pcn_zpa_zpbo",), default=False, cost=linear('ZPBO', 'ZPA'), topology=True),
+]
+
+CHECKS += ATTRIBUTE_CHECKS
+
+CHECKS_BY_ID = {check.id: check for check in CHECKS}
+
+def select_checks(choice, check_ids=None):
+    available = [check for check in CHECKS if choice in check.modes]
+    if not check_ids:
+        return [check for check in available if check.default]
+    unknown = [check_id for check_id in check_ids if check_id not in {check.id for check in available}]
+    if unknown:
+        raise ValueError(f"Unknown checks for '{choice}': {unknown}")
+    return [check for check in available if check.id in check_ids]
+
+def required_columns(checks):
+    columns = {}
+    for check in checks:
+        for layer, layer_columns in check.layers.items():
+            columns.setdefault(layer, set()).update(layer_columns)
+    return columns
+
+def loaded_columns(checks):
+    columns = required_columns(checks)
+    for check in checks:
+        for layer, layer_columns in check.optional.items():
+            columns.setdefault(layer, set()).update(layer_columns)
+    return columns
+
+def estimate_cost(check, counts):
+    cost = check.cost or linear(*check.layers)
+    return cost(counts)
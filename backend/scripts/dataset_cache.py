@@ -0,0 +1,118 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import shapely
+from config import WARM_CACHE_MAX_BYTES
+
+# Rough GEOS footprint: pandas only sees the Python wrapper of each geometry
+BYTES_PER_COORDINATE = 16
+BYTES_PER_GEOMETRY = 100
+# Spatial index products: one tree entry per indexed geometry
+BYTES_PER_INDEX_ENTRY = 40
+
+@dataclass
+class Dataset:
+    id: str
+    project: str
+    choice: str
+    layers: object
+    # layer -> attribute columns that were loaded
+    columns: dict
+    # derived products shared by checks (spatial indexes, reprojected layers, ...)
+    products: dict = field(default_factory=dict)
+    size: int = 0
+
+def dataset_id(project, choice, hashes, columns):
+    # The loaded columns are part of the key: a narrower selection must not replace a wider entry
+    key = ':'.join(
+        [project or '', choice]
+        + [f"{layer}={hashes[layer]}[{','.join(sorted(columns.get(layer, ())))}]" for layer in sorted(hashes)]
+    )
+    return hashlib.sha256(key.encode()).hexdigest()[:24]
+
+def frame_size(gdf):
+    size = int(gdf.drop(columns=gdf.geometry.name).memory_usage(deep=True).sum())
+    geometries = gdf.geometry.values
+    size += int(shapely.get_num_coordinates(geometries).sum()) * BYTES_PER_COORDINATE
+    return size + len(geometries) * BYTES_PER_GEOMETRY
+
+def estimate_size(layers, products=None):
+    frames = list(layers.frames.values())
+    total = sum(frame_size(gdf) for gdf in frames)
+    for value in list((products or {}).values()):
+        if any(value is gdf for gdf in frames):
+            # aligned product of a layer already in the target CRS
+            continue
+        if hasattr(value, 'memory_usage'):
+            total += frame_size(value)
+        else:
+            total += len(value) * BYTES_PER_INDEX_ENTRY
+    return total
+
+class DatasetCache:
+    def __init__(self, max_bytes=WARM_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            dataset = self.entries.get(key)
+            if dataset is not None:
+                self.entries.move_to_end(key)
+            return dataset
+
+    def resize(self, dataset, size):
+        with self.lock:
+            if self.entries.get(dataset.id) is not dataset:
+                dataset.size = size
+                return
+            self.total += size - dataset.size
+            dataset.size = size
+            while self.total > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.total -= evicted.size
+
+    def put(self, dataset):
+        if dataset.size > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(dataset.id, None)
+            if previous is not None:
+                self.total -= previous.size
+            self.entries[dataset.id] = dataset
+            self.total += dataset.size
+            while self.total > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.total -= evicted.size
+
+warm_datasets = DatasetCache()
+
+def remember_dataset(project, choice, layers, columns):
+    dataset = Dataset(
+        id=dataset_id(project, choice, layers.hashes, columns),
+        project=project,
+        choice=choice,
+        layers=layers,
+        columns={layer: set(layer_columns) for layer, layer_columns in columns.items()},
+    )
+    dataset.size = estimate_size(layers)
+    warm_datasets.put(dataset)
+    return dataset
+
+def refresh_dataset_size(dataset):
+    # Products (reprojected layers, indexes) are attached by the checks after the dataset was cached
+    warm_datasets.resize(dataset, estimate_size(dataset.layers, dataset.products))
+
+def missing_columns(dataset, columns):
+    missing = {}
+    for layer, layer_columns in columns.items():
+        if layer not in dataset.columns:
+            missing[layer] = sorted(layer_columns) or ['geometry']
+            continue
+        absent = set(layer_columns) - dataset.columns[layer]
+        if absent:
+            missing[layer] = sorted(absent)
+    return missing
@@ -0,0 +1,63 @@
+import time
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+
+@dataclass
+class TimedOut:
+    # features processed by the check's main loop out of total, when it reported them
+    done: int
+    total: object
+    elapsed: float
+
+    def to_dict(self):
+        progress = asdict(self)
+        progress["progress"] = round(self.done / self.total, 3) if self.total else None
+        return progress
+
+class CheckTimeout(Exception):
+    def __init__(self, deadline):
+        super().__init__(f"Check exceeded its {deadline.seconds} s deadline")
+        self.deadline = deadline
+
+class Deadline:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.start = time.monotonic()
+        self.done = 0
+        self.total = None
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def expired(self):
+        return self.seconds is not None and self.elapsed() > self.seconds
+
+    def timed_out(self):
+        return TimedOut(self.done, self.total, round(self.elapsed(), 3))
+
+_current = contextvars.ContextVar('deadline', default=None)
+
+@contextmanager
+def deadline(seconds):
+    current = Deadline(seconds)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+
+def track(total):
+    current = _current.get()
+    if current is not None:
+        current.done = 0
+        current.total = total
+
+def checkpoint(step=1):
+    # Called from the checks' main loops: records progress and stops the check once its deadline passed
+    current = _current.get()
+    if current is None:
+        return
+    current.done += step
+    if current.expired():
+        raise CheckTimeout(current)
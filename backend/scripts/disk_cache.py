@@ -0,0 +1,47 @@
+import os
+
+def touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def directory_size(directory):
+    total = 0
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def evict_lru(directory, max_bytes):
+    entries = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        size = directory_size(path) if os.path.isdir(path) else stat.st_size
+        entries.append((stat.st_mtime, size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            if os.path.isdir(path):
+                for root, dirs, files in os.walk(path, topdown=False):
+                    for name in files:
+                        os.unlink(os.path.join(root, name))
+                    for name in dirs:
+                        os.rmdir(os.path.join(root, name))
+                os.rmdir(path)
+            else:
+                os.unlink(path)
+            total -= size
+        except OSError as e:
+            print(f"Error evicting cache entry {path}: {e}")
+    return total
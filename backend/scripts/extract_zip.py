@@ -1,8 +1,90 @@
-import aiofiles
 import zipfile
 import os
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import EXTRACT_WORKERS, MAX_EXTRACTED_BYTES, MAX_COMPRESSION_RATIO, MIN_RATIO_CHECK_SIZE
 
-async def extract_zip(zip_path, extract_to):
+COPY_CHUNK_SIZE = 1024 * 1024
+
+class ExtractionBudgetExceeded(Exception):
+    pass
+
+class _Budget:
+    def __init__(self, max_bytes):
+        self.remaining = max_bytes
+        self.lock = threading.Lock()
+
+    def consume(self, size):
+        with self.lock:
+            self.remaining -= size
+            if self.remaining < 0:
+                raise ExtractionBudgetExceeded(f"Archive expands beyond {MAX_EXTRACTED_BYTES} bytes")
+
+def select_members(infos, layer_keys=None):
+    members = []
+    for info in infos:
+        if info.is_dir() or info.filename.startswith('__MACOSX/'):
+            continue
+        stem = os.path.splitext(os.path.basename(info.filename))[0].upper()
+        if layer_keys is None or stem in layer_keys:
+            members.append(info)
+    return members
+
+def check_budget(members, max_bytes=MAX_EXTRACTED_BYTES):
+    total = 0
+    for info in members:
+        total += info.file_size
+        if total > max_bytes:
+            raise ExtractionBudgetExceeded(f"Archive expands beyond {max_bytes} bytes")
+        if info.file_size > MIN_RATIO_CHECK_SIZE and info.file_size > MAX_COMPRESSION_RATIO * max(info.compress_size, 1):
+            raise ExtractionBudgetExceeded(
+                f"{info.filename} exceeds the maximum compression ratio of {MAX_COMPRESSION_RATIO}"
+            )
+    return total
+
+def check_archive_budget(zip_path, layer_keys=None):
+    with zipfile.ZipFile(zip_path, 'r') as archive:
+        return check_budget(select_members(archive.infolist(), layer_keys))
+
+def _target_path(extract_to, filename):
+    root = os.path.realpath(extract_to)
+    target = os.path.realpath(os.path.join(root, filename))
+    if not target.startswith(root + os.sep):
+        raise zipfile.BadZipFile(f"Unsafe path in archive: {filename}")
+    return target
+
+def _extract_member(zip_path, info, extract_to, budget):
+    target = _target_path(extract_to, info.filename)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    written = 0
+    with zipfile.ZipFile(zip_path, 'r') as archive, archive.open(info) as source, open(target, 'wb') as f:
+        while True:
+            chunk = source.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > info.file_size:
+                raise ExtractionBudgetExceeded(f"{info.filename} is larger than declared in the archive")
+            budget.consume(len(chunk))
+            f.write(chunk)
+    return target
+
+def _extract(zip_path, extract_to, layer_keys):
+    with zipfile.ZipFile(zip_path, 'r') as archive:
+        members = select_members(archive.infolist(), layer_keys)
+    check_budget(members)
+
+    budget = _Budget(MAX_EXTRACTED_BYTES)
+    with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS, thread_name_prefix='extract_zip') as executor:
+        futures = [executor.submit(_extract_member, zip_path, info, extract_to, budget) for info in members]
+        try:
+            return [future.result() for future in futures]
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+async def extract_zip(zip_path, extract_to, layer_keys=None):
     loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, zipfile.ZipFile(zip_path, 'r').extractall, extract_to)
\ No newline at end of file
+    return await loop.run_in_executor(None, _extract, zip_path, extract_to, layer_keys)
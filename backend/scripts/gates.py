@@ -0,0 +1,52 @@
+import shapely
+from scripts.checks import required_columns
+
+# Blocking rules: cheap, linear checks that make the checks reading a failing layer or column pointless
+
+def topology_layers(checks):
+    return sorted({layer for check in checks if check.topology for layer in check.layers})
+
+def check_columns(layers, checks):
+    missing = {}
+    for layer, columns in required_columns(checks).items():
+        absent = sorted(set(columns) - set(layers[layer].columns))
+        if absent:
+            missing[layer] = absent
+    return missing
+
+def check_crs(layers, checks):
+    return [layer for layer in topology_layers(checks) if layers[layer].crs is None]
+
+def check_geometries(layers, checks):
+    invalid = {}
+    for layer in topology_layers(checks):
+        # Missing geometries count as invalid, the checks dereference every row's geometry
+        count = int((~shapely.is_valid(layers[layer].geometry.values)).sum())
+        if count:
+            invalid[layer] = count
+    return invalid
+
+GATES = [
+    ('missing_columns', check_columns),
+    ('missing_crs', check_crs),
+    ('invalid_geometries', check_geometries),
+]
+
+def run_gates(layers, checks):
+    blocking = {}
+    for name, gate in GATES:
+        failure = gate(layers, checks)
+        if failure:
+            blocking[name] = failure
+    return blocking
+
+def blocked_checks(checks, blocking):
+    # A check is skipped when it needs a missing column, or when it is a topology check reading
+    # a layer without CRS or with invalid geometries; the other checks still run
+    missing = blocking.get('missing_columns', {})
+    failing = set(blocking.get('missing_crs', ())) | set(blocking.get('invalid_geometries', {}))
+    return [
+        check for check in checks
+        if any(set(columns) & set(missing.get(layer, ())) for layer, columns in check.layers.items())
+        or (check.topology and failing & set(check.layers))
+    ]
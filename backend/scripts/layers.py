@@ -0,0 +1,18 @@
+LAYERS = [
+    'PB', 'PA', 'ZPBO', 'ZSRO', 'ZNRO', 'ZPA', 'CB', 'ADRESSE', 'CM', 'SUPPORT', 'SRO',
+    'NRO', 'PEP', 'CREATION_CONDUITE'
+]
+
+# Layers delivered once per network type, e.g. CB_DI.shp / CB_TR.shp
+TYPED_LAYERS = {'CB', 'CM', 'PEP', 'CREATION_CONDUITE'}
+
+def shapefile_name(layer, choice):
+    if layer in TYPED_LAYERS:
+        return f"{layer}_{choice.upper()}.shp"
+    return f"{layer}.shp"
+
+def required_shapefiles(choice):
+    return {layer: shapefile_name(layer, choice) for layer in LAYERS}
+
+def manifest_key(shapefile):
+    return shapefile[:-len('.shp')].upper()
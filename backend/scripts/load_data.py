@@ -1,21 +1,64 @@
 import geopandas as gpd
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from config import LOAD_WORKERS, PARSE_CACHE_ENABLED
+from scripts.parse_cache import layer_hash, get_cached_layer, store_cached_layer
 
-async def load_data(pb_path, zpbo_path, zsro_path, zpa_path, cb_di_path, pa_path, znro_path, adresse_path, cm_di_path, support_path, sro_path, nro_path, pep_di_path, creation_conduite_di_path):
+try:
+    import pyarrow
+    USE_ARROW = True
+except ImportError:
+    USE_ARROW = False
+
+_load_executor = ThreadPoolExecutor(max_workers=LOAD_WORKERS, thread_name_prefix='load_data')
+
+@dataclass
+class Layers:
+    frames: dict = field(default_factory=dict)
+    read_times: dict = field(default_factory=dict)
+    hashes: dict = field(default_factory=dict)
+    cache_hits: set = field(default_factory=set)
+
+    def __getitem__(self, layer):
+        return self.frames[layer]
+
+    def __contains__(self, layer):
+        return layer in self.frames
+
+def read_layer(path, columns=None):
+    start = time.perf_counter()
+    digest = layer_hash(path)
+    gdf = get_cached_layer(digest, columns) if PARSE_CACHE_ENABLED else None
+    cache_hit = gdf is not None
+    if not cache_hit:
+        gdf = gpd.read_file(path, engine='pyogrio', use_arrow=USE_ARROW, columns=columns)
+        if PARSE_CACHE_ENABLED:
+            store_cached_layer(digest, columns, gdf)
+    return gdf, time.perf_counter() - start, digest, cache_hit
+
+async def load_data(paths, columns=None):
     loop = asyncio.get_event_loop()
-    pb_gdf = await loop.run_in_executor(None, gpd.read_file, pb_path)
-    zpbo_gdf = await loop.run_in_executor(None, gpd.read_file, zpbo_path)
-    zsro_gdf = await loop.run_in_executor(None, gpd.read_file, zsro_path)
-    zpa_gdf = await loop.run_in_executor(None, gpd.read_file, zpa_path)
-    cb_di_gdf = await loop.run_in_executor(None, gpd.read_file, cb_di_path)
-    pa_gdf = await loop.run_in_executor(None, gpd.read_file, pa_path)
-    znro_gdf = await loop.run_in_executor(None, gpd.read_file, znro_path)
-    adresse_gdf = await loop.run_in_executor(None, gpd.read_file, adresse_path)
-    cm_di_gdf = await loop.run_in_executor(None, gpd.read_file, cm_di_path)
-    support_gdf = await loop.run_in_executor(None, gpd.read_file, support_path)
-    sro_gdf = await loop.run_in_executor(None, gpd.read_file, sro_path)
-    nro_gdf = await loop.run_in_executor(None, gpd.read_file, nro_path)
-    pep_di_gdf = await loop.run_in_executor(None, gpd.read_file, pep_di_path)
-    creation_conduite_di_gdf = await loop.run_in_executor(None, gpd.read_file, creation_conduite_di_path)
-    
-    return pb_gdf, zpbo_gdf, zsro_gdf, zpa_gdf, cb_di_gdf, pa_gdf, znro_gdf, adresse_gdf, cm_di_gdf, support_gdf, sro_gdf, nro_gdf, pep_di_gdf, creation_conduite_di_gdf
\ No newline at end of file
+    names = list(paths)
+    results = await asyncio.gather(*(
+        loop.run_in_executor(
+            _load_executor, read_layer, paths[name],
+            sorted(columns[name]) if columns is not None and name in columns else None,
+        )
+        for name in names
+    ))
+
+    layers = Layers()
+    for name, (gdf, elapsed, digest, cache_hit) in zip(names, results):
+        layers.frames[name] = gdf
+        layers.read_times[name] = elapsed
+        layers.hashes[name] = digest
+        if cache_hit:
+            layers.cache_hits.add(name)
+
+    print("Temps de lecture des couches :")
+    for name, elapsed in sorted(layers.read_times.items(), key=lambda item: -item[1]):
+        source = "cache" if name in layers.cache_hits else "shapefile"
+        print(f"- {name}: {elapsed:.3f} s ({len(layers[name])} entités, {source})")
+    return layers
@@ -0,0 +1,64 @@
+import numpy as np
+import shapely
+
+# Point-like network elements, in the priority used to name the node a cable end lies on
+NODE_LAYERS = ('NRO', 'SRO', 'PA', 'PB', 'SUPPORT', 'ADRESSE')
+# Distance (CRS units, metres for Lambert-93) under which a point counts as lying on a node
+NODE_TOLERANCE = 0.01
+
+class NodeIndex:
+    def __init__(self, frames, tolerance=NODE_TOLERANCE):
+        self.tolerance = tolerance
+        geometries, types = [], []
+        for priority, layer in enumerate(NODE_LAYERS):
+            gdf = frames[layer]
+            geometries.append(np.asarray(gdf.geometry.values))
+            types.append(np.full(len(gdf), priority))
+        self.geometries = np.concatenate(geometries)
+        self.types = np.concatenate(types)
+        self.tree = shapely.STRtree(self.geometries)
+        # Node mask per type set, built once: within() runs once per unmatched cable
+        self.masks = {}
+
+    def __len__(self):
+        return len(self.geometries)
+
+    def _mask(self, types):
+        key = tuple(types)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = self.masks[key] = np.isin(self.types, [NODE_LAYERS.index(layer) for layer in types])
+        return mask
+
+    def near(self, geometries, types=NODE_LAYERS):
+        # (geometry position, node position) pairs closer than the tolerance
+        queried, nodes = self.tree.query(geometries, predicate='dwithin', distance=self.tolerance)
+        keep = self._mask(types)[nodes]
+        return queried[keep], nodes[keep]
+
+    def on_node(self, geometries, types=NODE_LAYERS):
+        # True where every part of the geometry is a point lying on a node
+        geometries = np.asarray(geometries, dtype=object)
+        parts, owners = shapely.get_parts(geometries, return_index=True)
+        on_node = np.zeros(len(geometries), dtype=bool)
+        if not len(parts):
+            return on_node
+        matched_parts = np.zeros(len(parts), dtype=bool)
+        matched_parts[self.near(parts, types)[0]] = True
+        matched_parts &= shapely.get_type_id(parts) == shapely.GeometryType.POINT
+        unmatched = np.zeros(len(geometries), dtype=bool)
+        unmatched[owners[~matched_parts]] = True
+        on_node[np.unique(owners)] = True
+        return on_node & ~unmatched
+
+    def node_type(self, points, types=NODE_LAYERS):
+        # Highest priority node type under each point, None where there is none
+        queried, nodes = self.near(points, types)
+        best = np.full(len(points), len(NODE_LAYERS))
+        np.minimum.at(best, queried, self.types[nodes])
+        return [NODE_LAYERS[priority] if priority < len(NODE_LAYERS) else None for priority in best]
+
+    def within(self, geometry, types=NODE_LAYERS):
+        # Nodes lying inside the geometry, exactly as GeoSeries.within(geometry)
+        nodes = self.tree.query(geometry, predicate='contains')
+        return nodes[self._mask(types)[nodes]]
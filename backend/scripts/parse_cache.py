@@ -0,0 +1,78 @@
+import os
+import hashlib
+import zipfile
+import threading
+import geopandas as gpd
+from config import PARSE_CACHE_DIR, PARSE_CACHE_MAX_BYTES
+from find_shapefiles import split_archive_path
+from scripts.disk_cache import touch, evict_lru
+
+SIDECAR_EXTENSIONS = ('.shp', '.shx', '.dbf', '.prj', '.cpg')
+HASH_CHUNK_SIZE = 1024 * 1024
+# Bump when the on-disk layout of cached layers changes
+CACHE_FORMAT = '1'
+
+def _hash_stream(digest, stream):
+    while True:
+        chunk = stream.read(HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+
+def _sidecars(names, shp_name):
+    stem = os.path.splitext(shp_name)[0].lower()
+    by_extension = {}
+    for name in names:
+        name_stem, extension = os.path.splitext(name)
+        if name_stem.lower() == stem and extension.lower() in SIDECAR_EXTENSIONS:
+            by_extension[extension.lower()] = name
+    return [(extension, by_extension[extension]) for extension in SIDECAR_EXTENSIONS if extension in by_extension]
+
+def layer_hash(path):
+    digest = hashlib.sha256()
+    zip_path, shp_path = split_archive_path(path)
+
+    if zip_path is None:
+        directory = os.path.dirname(shp_path)
+        for extension, name in _sidecars(os.listdir(directory), os.path.basename(shp_path)):
+            digest.update(extension.encode())
+            with open(os.path.join(directory, name), 'rb') as f:
+                _hash_stream(digest, f)
+    else:
+        with zipfile.ZipFile(zip_path, 'r') as archive:
+            for extension, member in _sidecars(archive.namelist(), shp_path):
+                digest.update(extension.encode())
+                with archive.open(member) as f:
+                    _hash_stream(digest, f)
+    return digest.hexdigest()
+
+def _entry_path(layer_hash, columns):
+    selection = '*' if columns is None else ','.join(sorted(columns))
+    key = hashlib.sha256(f"{CACHE_FORMAT}:{layer_hash}:{selection}".encode()).hexdigest()
+    return os.path.join(PARSE_CACHE_DIR, f"{key}.parquet")
+
+def get_cached_layer(layer_hash, columns=None):
+    path = _entry_path(layer_hash, columns)
+    if not os.path.exists(path):
+        return None
+    try:
+        gdf = gpd.read_parquet(path)
+    except Exception as e:
+        print(f"Error reading cached layer {path}: {e}")
+        return None
+    touch(path)
+    return gdf
+
+def store_cached_layer(layer_hash, columns, gdf):
+    os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+    path = _entry_path(layer_hash, columns)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        gdf.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error caching layer {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    evict_lru(PARSE_CACHE_DIR, PARSE_CACHE_MAX_BYTES)
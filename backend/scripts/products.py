@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from scripts.node_index import NodeIndex, NODE_LAYERS
+
+PARENT = 'parent'
+WORKER = 'worker'
+
+@dataclass
+class Product:
+    name: str
+    # 'parent' products are computed once per job and shared with the check workers;
+    # 'worker' products (spatial indexes) do not pickle and are memoized per worker and job
+    where: str
+    layers: tuple
+    build: object
+
+def aligned(layer, reference):
+    return f"aligned:{layer}@{reference}"
+
+def sindex(layer):
+    return f"sindex:{layer}"
+
+def nodes(reference):
+    return f"nodes:{reference}"
+
+def align_layer(gdf, reference):
+    # A missing CRS is left alone so the check reports it as before
+    if gdf.crs is None or reference.crs is None or gdf.crs == reference.crs:
+        return gdf
+    return gdf.to_crs(reference.crs)
+
+def product(name):
+    kind, _, args = name.partition(':')
+    if kind == 'aligned':
+        layer, reference = args.split('@')
+        return Product(name, PARENT, (layer, reference), lambda ctx: align_layer(ctx[layer], ctx[reference]))
+    if kind == 'sindex':
+        return Product(name, WORKER, (args,), lambda ctx: ctx[args].sindex)
+    if kind == 'nodes':
+        return Product(name, WORKER, NODE_LAYERS + (args,), lambda ctx: NodeIndex({
+            layer: align_layer(ctx[layer], ctx[args]) for layer in NODE_LAYERS
+        }))
+    raise KeyError(f"Unknown product: {name}")
+
+class RuleContext:
+    def __init__(self, frames, products=None):
+        self.frames = frames
+        self.products = {} if products is None else products
+
+    def __getitem__(self, name):
+        if name in self.frames:
+            return self.frames[name]
+        return self.product(name)
+
+    def __contains__(self, name):
+        return name in self.frames or name in self.products
+
+    def product(self, name):
+        if name not in self.products:
+            self.products[name] = product(name).build(self)
+        return self.products[name]
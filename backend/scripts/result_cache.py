@@ -0,0 +1,67 @@
+import os
+import json
+import hashlib
+import asyncio
+import threading
+import aiofiles
+from config import RESULT_CACHE_DIR, RESULT_CACHE_MAX_BYTES, RULESET_VERSION
+from scripts.disk_cache import touch, evict_lru
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+RULE_FILES = [
+    os.path.join(SCRIPTS_DIR, 'verify.py'),
+    os.path.join(SCRIPTS_DIR, 'verify_di.py'),
+    os.path.join(SCRIPTS_DIR, 'checks.py'),
+    os.path.join(SCRIPTS_DIR, 'products.py'),
+    os.path.join(SCRIPTS_DIR, 'gates.py'),
+    os.path.join(SCRIPTS_DIR, 'scheduler.py'),
+    os.path.join(SCRIPTS_DIR, 'node_index.py'),
+    os.path.join(SCRIPTS_DIR, 'zone_lookup.py'),
+    os.path.join(SCRIPTS_DIR, 'zone_hierarchy.py'),
+]
+
+_ruleset_version = None
+
+def ruleset_version():
+    global _ruleset_version
+    if _ruleset_version is None:
+        digest = hashlib.sha256(RULESET_VERSION.encode())
+        for path in RULE_FILES:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        _ruleset_version = digest.hexdigest()[:16]
+    return _ruleset_version
+
+def result_cache_key(upload_sha256, choice, check_ids):
+    checks = ','.join(sorted(check_ids))
+    return hashlib.sha256(f"{upload_sha256}:{choice}:{checks}:{ruleset_version()}".encode()).hexdigest()
+
+def _entry_path(key):
+    return os.path.join(RESULT_CACHE_DIR, f"{key}.json")
+
+async def get_cached_result(key):
+    path = _entry_path(key)
+    try:
+        async with aiofiles.open(path, 'r', encoding='utf-8') as f:
+            report = json.loads(await f.read())
+    except (OSError, ValueError):
+        return None
+    touch(path)
+    return report
+
+async def store_result(key, report):
+    path = _entry_path(key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+        async with aiofiles.open(tmp_path, 'w', encoding='utf-8') as f:
+            await f.write(json.dumps(report, default=str))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        # The report is already computed: a cache write failure must not fail the job
+        print(f"Error caching result {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, evict_lru, RESULT_CACHE_DIR, RESULT_CACHE_MAX_BYTES)
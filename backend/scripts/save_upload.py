@@ -0,0 +1,26 @@
+import os
+import hashlib
+import aiofiles
+from config import UPLOAD_CHUNK_SIZE, MAX_UPLOAD_SIZE
+
+class UploadTooLarge(Exception):
+    pass
+
+async def save_upload(file, file_path, max_size=MAX_UPLOAD_SIZE, chunk_size=UPLOAD_CHUNK_SIZE):
+    sha256 = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(file_path, 'wb') as f:
+            while True:
+                chunk = file.stream.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(f"Upload exceeds the maximum size of {max_size} bytes")
+                sha256.update(chunk)
+                await f.write(chunk)
+    except UploadTooLarge:
+        os.remove(file_path)
+        raise
+    return size, sha256.hexdigest()
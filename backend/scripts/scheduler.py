@@ -0,0 +1,174 @@
+import uuid
+import asyncio
+import inspect
+from graphlib import TopologicalSorter
+from config import CHECK_TIMEOUT, CHECK_TIMEOUT_GRACE
+from scripts.checks import CHECKS_BY_ID, estimate_cost
+from scripts.gates import GATES, run_gates, blocked_checks, topology_layers
+from scripts.products import RuleContext, product, PARENT
+from scripts.deadline import deadline, CheckTimeout, TimedOut
+from scripts.shared_layers import publish_layers, attach_layers, attached_products
+from scripts.check_pool import task_started, on_task_start, forget_task
+
+PRODUCT = 'product'
+RULE = 'rule'
+
+def parent_products(check):
+    return [name for name in check.products if product(name).where == PARENT]
+
+def build_graph(checks):
+    # Rules wait on the parent-side products they declare; worker-side products
+    # are built lazily by the first rule that needs them in each worker.
+    graph = {}
+    for check in checks:
+        graph[(RULE, check.id)] = {(PRODUCT, name) for name in parent_products(check)}
+        for name in parent_products(check):
+            graph.setdefault((PRODUCT, name), set())
+    return graph
+
+def node_order(node, counts):
+    # Products unblock rules so they go first, then the cheapest rules
+    kind, name = node
+    if kind == PRODUCT:
+        return (0, sum(counts.get(layer, 0) for layer in product(name).layers))
+    return (1, estimate_cost(CHECKS_BY_ID[name], counts))
+
+def plan_checks(checks, counts):
+    gate_cost = sum(counts.get(layer, 0) for layer in {layer for check in checks for layer in check.layers})
+    gate_cost += sum(counts.get(layer, 0) for layer in topology_layers(checks))
+    plan = [{"id": name, "kind": "gate", "cost": gate_cost} for name, _ in GATES]
+    nodes = sorted(build_graph(checks), key=lambda node: node_order(node, counts))
+    for kind, name in nodes:
+        plan.append({"id": name, "kind": kind, "cost": node_order((kind, name), counts)[1]})
+    return plan
+
+def print_plan(plan):
+    print("Ordre d'exécution prévu :")
+    for step in plan:
+        print(f"- {step['id']} ({step['kind']}, coût estimé {step['cost']:.0f})")
+
+def check_timeout(check):
+    return check.timeout if check.timeout is not None else CHECK_TIMEOUT
+
+async def execute(check, layers, choice):
+    with deadline(check_timeout(check)) as current:
+        try:
+            result = check.run(layers, choice)
+            if inspect.isawaitable(result):
+                result = await result
+        except CheckTimeout:
+            return current.timed_out()
+    return result
+
+def run_check_in_process(check_id, shared, choice, task_id=None):
+    task_started(task_id)
+    frames = attach_layers(shared)
+    layers = RuleContext(frames, attached_products(shared.token))
+    return asyncio.run(execute(CHECKS_BY_ID[check_id], layers, choice))
+
+def build_report(checks, results):
+    report = {}
+    timed_out = {}
+    for check in checks:
+        result = results[check.id]
+        if isinstance(result, TimedOut):
+            timed_out[check.id] = result.to_dict()
+        elif len(check.outputs) == 1:
+            report[check.outputs[0]] = result
+        else:
+            report.update(zip(check.outputs, result))
+    if timed_out:
+        report["timed_out"] = timed_out
+    return report
+
+async def run_checks(checks, layers, choice, executor=None, products=None):
+    loop = asyncio.get_event_loop()
+    counts = {layer: len(layers[layer]) for layer in {layer for check in checks for layer in check.layers}}
+    print_plan(plan_checks(checks, counts))
+
+    blocking = await loop.run_in_executor(None, run_gates, layers, checks)
+    skipped = blocked_checks(checks, blocking)
+    if skipped:
+        print(f"Règles bloquantes en échec {sorted(blocking)}, vérifications ignorées : {[check.id for check in skipped]}")
+    skipped_ids = {check.id for check in skipped}
+    checks = [check for check in checks if check.id not in skipped_ids]
+
+    context = RuleContext(layers, products)
+    needed = {layer for check in checks for layer in check.layers}
+
+    shared = None
+    if executor is not None:
+        shared = await loop.run_in_executor(None, publish_layers, {layer: layers[layer] for layer in needed})
+
+    def share_product(name, value):
+        same = next((layer for layer in needed if layers[layer] is value), None)
+        if same is not None:
+            shared.alias(name, same)
+        else:
+            shared.add(name, value)
+
+    async def run_node(node):
+        kind, name = node
+        if kind == PRODUCT:
+            value = await loop.run_in_executor(None, context.product, name)
+            if shared is not None:
+                await loop.run_in_executor(None, share_product, name, value)
+            return None
+        check = CHECKS_BY_ID[name]
+        if shared is None:
+            return await execute(check, context, choice)
+        subset = shared.subset(list(check.layers) + parent_products(check))
+        timeout = check_timeout(check)
+        if timeout is None:
+            return await loop.run_in_executor(executor, run_check_in_process, check.id, subset, choice)
+
+        # The pool is shared by every job of this process: the backstop starts when a worker
+        # picks the check up, not while it waits behind other jobs' checks
+        task_id = uuid.uuid4().hex
+        started = asyncio.Event()
+        on_task_start(task_id, lambda: loop.call_soon_threadsafe(started.set))
+        try:
+            future = loop.run_in_executor(executor, run_check_in_process, check.id, subset, choice, task_id)
+            waiting = asyncio.ensure_future(started.wait())
+            await asyncio.wait({future, waiting}, return_when=asyncio.FIRST_COMPLETED)
+            waiting.cancel()
+            begun = loop.time()
+            try:
+                # Backstop for checks that never reach a checkpoint; the worker itself cannot be interrupted.
+                # Row loops and pair batches call checkpoint(), so those checks stop at their deadline.
+                # Single library calls have no checkpoint and can keep a worker busy past it:
+                # no_overlap (gpd.overlay), the vectorized zone checks and the spatial index queries
+                # that build each check's candidate pairs.
+                return await asyncio.wait_for(future, timeout + CHECK_TIMEOUT_GRACE)
+            except asyncio.TimeoutError:
+                print(f"La vérification {check.id} n'a pas répondu avant son délai, résultat abandonné")
+                return TimedOut(0, None, round(loop.time() - begun, 3))
+        finally:
+            forget_task(task_id)
+
+    sorter = TopologicalSorter(build_graph(checks))
+    sorter.prepare()
+    results = {}
+    pending = {}
+    try:
+        while sorter.is_active():
+            for node in sorted(sorter.get_ready(), key=lambda node: node_order(node, counts)):
+                pending[asyncio.ensure_future(run_node(node))] = node
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                kind, name = pending.pop(task)
+                result = task.result()
+                if kind == RULE:
+                    results[name] = result
+                sorter.done((kind, name))
+    finally:
+        for task in pending:
+            task.cancel()
+        if shared is not None:
+            shared.release()
+
+    report = build_report(checks, results)
+    if blocking:
+        report["blocking"] = blocking
+        report["skipped"] = [check.id for check in skipped]
+    return report
@@ -0,0 +1,83 @@
+import re
+import struct
+import zipfile
+from find_shapefiles import split_archive_path
+
+SHAPE_TYPES = {
+    0: 'Null', 1: 'Point', 3: 'LineString', 5: 'Polygon', 8: 'MultiPoint',
+    11: 'PointZ', 13: 'LineStringZ', 15: 'PolygonZ', 18: 'MultiPointZ',
+    21: 'PointM', 23: 'LineStringM', 25: 'PolygonM', 28: 'MultiPointM', 31: 'MultiPatch',
+}
+DBF_TYPES = {'C': 'str', 'N': 'number', 'F': 'float', 'L': 'bool', 'D': 'date', 'M': 'memo'}
+PRJ_NAME = re.compile(r'^\s*\w+\[\s*"([^"]*)"')
+
+def _read_shp_header(data):
+    if len(data) < 100 or struct.unpack('>i', data[0:4])[0] != 9994:
+        raise ValueError("En-tête .shp invalide")
+    shape_type = struct.unpack('<i', data[32:36])[0]
+    xmin, ymin, xmax, ymax = struct.unpack('<4d', data[36:68])
+    return {
+        'geometry_type': SHAPE_TYPES.get(shape_type, f"Unknown({shape_type})"),
+        'bbox': [xmin, ymin, xmax, ymax],
+    }
+
+def _read_dbf_header(stream):
+    head = stream.read(32)
+    if len(head) < 32:
+        raise ValueError("En-tête .dbf invalide")
+    record_count, header_length = struct.unpack('<IH', head[4:10])
+    descriptors = stream.read(header_length - 32)
+    fields = {}
+    for offset in range(0, len(descriptors) - 31, 32):
+        descriptor = descriptors[offset:offset + 32]
+        if descriptor[0] == 0x0D:
+            break
+        name = descriptor[:11].split(b'\x00', 1)[0].decode('latin-1').strip()
+        field_type = chr(descriptor[11])
+        fields[name] = DBF_TYPES.get(field_type, field_type)
+    return record_count, fields
+
+def _crs_name(prj_text):
+    match = PRJ_NAME.match(prj_text)
+    return match.group(1) if match else None
+
+def read_layer_headers(entry, archive=None):
+    def open_sidecar(extension):
+        zip_path, member = split_archive_path(entry.files[extension])
+        if zip_path is None:
+            return open(member, 'rb')
+        return archive.open(member)
+
+    with open_sidecar('.shp') as f:
+        headers = _read_shp_header(f.read(100))
+
+    if '.shx' in entry.sidecars:
+        headers['feature_count'] = max(entry.sidecars['.shx'] - 100, 0) // 8
+
+    if '.dbf' in entry.sidecars:
+        with open_sidecar('.dbf') as f:
+            record_count, fields = _read_dbf_header(f)
+        headers.setdefault('feature_count', record_count)
+        headers['fields'] = fields
+    else:
+        headers['fields'] = {}
+
+    headers['crs'] = None
+    if '.prj' in entry.sidecars:
+        with open_sidecar('.prj') as f:
+            headers['crs'] = _crs_name(f.read().decode('latin-1'))
+    return headers
+
+def read_headers(entries, zip_path=None):
+    archive = zipfile.ZipFile(zip_path, 'r') if zip_path else None
+    try:
+        headers = {}
+        for key, entry in entries.items():
+            try:
+                headers[key] = read_layer_headers(entry, archive)
+            except (ValueError, OSError, KeyError, struct.error) as e:
+                headers[key] = {'error': str(e)}
+        return headers
+    finally:
+        if archive is not None:
+            archive.close()
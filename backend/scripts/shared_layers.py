@@ -0,0 +1,224 @@
+import time
+import uuid
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+# Attached layer sets kept per worker, so checks of the same job reuse rebuilt frames
+ATTACHED_JOBS = 4
+# Seconds between two checks, in each worker, for jobs whose layers the parent released
+RELEASE_POLL = 5
+
+@dataclass
+class SharedLayers:
+    token: str
+    # layer -> picklable descriptor of its shared-memory blocks
+    layers: dict
+    blocks: list = field(default_factory=list)
+    # one-byte block unlinked with the others, workers drop the job's frames once it is gone
+    sentinel: str = None
+
+    def subset(self, names):
+        names = set(names)
+        names |= {self.layers[name]['alias'] for name in names if 'alias' in self.layers[name]}
+        return SharedLayers(self.token, {name: self.layers[name] for name in names}, sentinel=self.sentinel)
+
+    def add(self, name, gdf):
+        self.layers[name] = _publish_layer(gdf, self.blocks)
+
+    def alias(self, name, target):
+        # A product identical to an already published layer shares its blocks
+        self.layers[name] = {'alias': target}
+
+    def release(self):
+        for block in self.blocks:
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks = []
+
+def _share_array(array, blocks):
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    blocks.append(block)
+    return (block.name, array.dtype.str, array.shape)
+
+def _share_bytes(data, blocks):
+    return _share_array(np.frombuffer(data, dtype=np.uint8), blocks)
+
+def _share_wkb(geometries, blocks):
+    wkb = shapely.to_wkb(geometries)
+    lengths = np.array([0 if value is None else len(value) for value in wkb], dtype=np.int64)
+    return {
+        'encoding': 'wkb',
+        'data': _share_bytes(b''.join(value or b'' for value in wkb), blocks),
+        'offsets': _share_array(np.concatenate([[0], np.cumsum(lengths)]), blocks),
+        'missing': _share_array(np.array([value is None for value in wkb], dtype=bool), blocks),
+    }
+
+def _share_geometry(geometries, blocks):
+    # The ragged encoding promotes a mix of single and multi-part geometries to the multi type
+    # and turns missing geometries into empty ones, so it is only used for uniform layers
+    types = shapely.get_type_id(geometries)
+    if not len(types) or (types < 0).any() or (types != types[0]).any():
+        return _share_wkb(geometries, blocks)
+    try:
+        geometry_type, coords, offsets = shapely.to_ragged_array(geometries)
+    except ValueError:
+        # Geometry collections have no ragged encoding
+        return _share_wkb(geometries, blocks)
+    return {
+        'encoding': 'ragged',
+        'type': int(geometry_type),
+        'coords': _share_array(coords, blocks),
+        'offsets': [_share_array(offset, blocks) for offset in offsets],
+    }
+
+def _publish_layer(gdf, blocks):
+    columns = {}
+    for column in gdf.columns:
+        if column == gdf.geometry.name:
+            continue
+        values = gdf[column]
+        if values.dtype.kind in 'biuf':
+            columns[column] = ('array', _share_array(values.to_numpy(), blocks))
+        else:
+            columns[column] = ('pickle', _share_bytes(pickle.dumps(values.to_numpy()), blocks))
+    return {
+        'geometry_name': gdf.geometry.name,
+        'geometry': _share_geometry(gdf.geometry.values, blocks),
+        'crs': gdf.crs.to_wkt() if gdf.crs is not None else None,
+        'index': None if isinstance(gdf.index, pd.RangeIndex) and gdf.index.start == 0 and gdf.index.step == 1
+                 else _share_bytes(pickle.dumps(gdf.index), blocks),
+        'length': len(gdf),
+        'columns': columns,
+    }
+
+def publish_layers(frames):
+    blocks = []
+    try:
+        sentinel = shared_memory.SharedMemory(create=True, size=1)
+        blocks.append(sentinel)
+        layers = {name: _publish_layer(gdf, blocks) for name, gdf in frames.items()}
+    except Exception:
+        SharedLayers(None, {}, blocks).release()
+        raise
+    return SharedLayers(uuid.uuid4().hex, layers, blocks, sentinel.name)
+
+# Worker side
+
+_attached = OrderedDict()
+_attached_lock = threading.Lock()
+
+def _open_block(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13: spawned workers share the parent's resource tracker, which
+        # already tracks the block, so attaching registers nothing new
+        return shared_memory.SharedMemory(name=name)
+
+def _attach_block(descriptor, handles):
+    name, dtype, shape = descriptor
+    block = _open_block(name)
+    handles.append(block)
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    array.flags.writeable = False
+    return array
+
+def _attach_geometry(descriptor, handles):
+    if descriptor['encoding'] == 'ragged':
+        coords = _attach_block(descriptor['coords'], handles)
+        offsets = tuple(_attach_block(offset, handles) for offset in descriptor['offsets'])
+        return shapely.from_ragged_array(shapely.GeometryType(descriptor['type']), coords, offsets)
+    data = _attach_block(descriptor['data'], handles)
+    offsets = _attach_block(descriptor['offsets'], handles)
+    missing = _attach_block(descriptor['missing'], handles)
+    geometries = np.empty(len(missing), dtype=object)
+    for i in range(len(missing)):
+        if not missing[i]:
+            geometries[i] = data[offsets[i]:offsets[i + 1]].tobytes()
+    return shapely.from_wkb(geometries)
+
+def _attach_layer(descriptor, handles):
+    data = {}
+    for column, (kind, block) in descriptor['columns'].items():
+        values = _attach_block(block, handles)
+        data[column] = values if kind == 'array' else pickle.loads(values.tobytes())
+    index = None
+    if descriptor['index'] is not None:
+        index = pickle.loads(_attach_block(descriptor['index'], handles).tobytes())
+    if index is None:
+        index = pd.RangeIndex(descriptor['length'])
+    frame = pd.DataFrame(data, index=index, copy=False)
+    geometry = gpd.GeoSeries(_attach_geometry(descriptor['geometry'], handles), index=frame.index, crs=descriptor['crs'])
+    return gpd.GeoDataFrame(frame, geometry=geometry.rename(descriptor['geometry_name']), crs=descriptor['crs'])
+
+def _drop_entry(entry):
+    entry['frames'].clear()
+    entry['products'].clear()
+    for handle in entry['handles']:
+        try:
+            handle.close()
+        except BufferError:
+            # A check abandoned by its backstop still holds views on the block
+            pass
+
+def _released(sentinel):
+    if sentinel is None:
+        return False
+    try:
+        block = _open_block(sentinel)
+    except FileNotFoundError:
+        return True
+    block.close()
+    return False
+
+def drop_released_jobs():
+    # Free the frames of the jobs the parent released, so idle workers do not keep them
+    with _attached_lock:
+        released = [token for token, entry in _attached.items() if _released(entry['sentinel'])]
+        for token in released:
+            _drop_entry(_attached.pop(token))
+
+def _watch_released_jobs():
+    while True:
+        time.sleep(RELEASE_POLL)
+        drop_released_jobs()
+
+def start_release_watcher():
+    threading.Thread(target=_watch_released_jobs, daemon=True).start()
+
+def attach_layers(shared):
+    drop_released_jobs()
+    with _attached_lock:
+        entry = _attached.get(shared.token)
+        if entry is None:
+            entry = {'frames': {}, 'products': {}, 'handles': [], 'sentinel': shared.sentinel}
+            _attached[shared.token] = entry
+            while len(_attached) > ATTACHED_JOBS:
+                _, evicted = _attached.popitem(last=False)
+                _drop_entry(evicted)
+        _attached.move_to_end(shared.token)
+
+        for name, descriptor in shared.layers.items():
+            if name not in entry['frames'] and 'alias' not in descriptor:
+                entry['frames'][name] = _attach_layer(descriptor, entry['handles'])
+        for name, descriptor in shared.layers.items():
+            if 'alias' in descriptor:
+                entry['frames'][name] = entry['frames'][descriptor['alias']]
+        return {name: entry['frames'][name] for name in shared.layers}
+
+def attached_products(token):
+    # Worker-side products of a job, built once and reused by its later checks
+    with _attached_lock:
+        return _attached[token]['products']
@@ -0,0 +1,93 @@
+import asyncio
+import zipfile
+from config import READ_FROM_ARCHIVE
+from scripts.layers import required_shapefiles, manifest_key
+from scripts.extract_zip import extract_zip, check_archive_budget, ExtractionBudgetExceeded
+from scripts.result_cache import store_result
+from scripts.load_data import load_data
+from scripts.checks import loaded_columns
+from scripts.scheduler import run_checks
+from scripts.check_pool import check_executor
+from scripts.dataset_cache import remember_dataset, refresh_dataset_size
+from find_shapefiles import (
+    find_shapefiles, find_shapefiles_in_zip, resolve_layers, delivery_problems, delivery_units, duplicate_layers,
+)
+from jobs import JobError
+
+class DeliveryError(JobError):
+    pass
+
+def check_delivery(manifest, required):
+    layer_keys = {manifest_key(shp) for shp in required.values()}
+    duplicates = duplicate_layers(manifest, layer_keys)
+    if duplicates:
+        raise DeliveryError(f"Shapefiles found in several directories: {duplicates}")
+    entries = resolve_layers(manifest, layer_keys)
+    missing_shapefiles, incomplete_shapefiles = delivery_problems(
+        entries, {shp: manifest_key(shp) for shp in required.values()}
+    )
+    if missing_shapefiles:
+        raise DeliveryError(f"Missing shapefiles: {missing_shapefiles}")
+    if incomplete_shapefiles:
+        raise DeliveryError(f"Incomplete shapefiles: {incomplete_shapefiles}")
+    return entries
+
+async def validate_entries(project, manifest, required, choice, checks):
+    entries = check_delivery(manifest, required)
+
+    columns = loaded_columns(checks)
+    paths = {
+        layer: entries[manifest_key(shp)].path
+        for layer, shp in required.items() if layer in columns
+    }
+    layers = await load_data(paths, columns)
+    dataset = remember_dataset(project, choice, layers, columns)
+
+    report = await run_checks(checks, layers, choice, check_executor(), dataset.products)
+    refresh_dataset_size(dataset)
+    report["dataset_id"] = dataset.id
+    return report
+
+async def validate_clients(units, required, choice, checks):
+    async def validate_client(client, manifest):
+        try:
+            return await validate_entries(client, manifest, required, choice, checks)
+        except DeliveryError as e:
+            return {"error": str(e)}
+
+    reports = await asyncio.gather(*(validate_client(client, manifest) for client, manifest in units.items()))
+    return dict(zip(units, reports))
+
+def partial(report):
+    reports = report["clients"].values() if "clients" in report else [report]
+    return any("timed_out" in client_report for client_report in reports)
+
+async def run_validation(workspace, zip_path, project, choice, checks, cache_key):
+    try:
+        required = required_shapefiles(choice)
+        layer_keys = {manifest_key(shp) for shp in required.values()}
+
+        try:
+            if READ_FROM_ARCHIVE:
+                await asyncio.get_event_loop().run_in_executor(None, check_archive_budget, zip_path, layer_keys)
+                manifest = await find_shapefiles_in_zip(zip_path)
+            else:
+                await extract_zip(zip_path, workspace.extract_dir, layer_keys)
+                manifest = await find_shapefiles(workspace.extract_dir)
+        except zipfile.BadZipFile as e:
+            raise JobError(f"Invalid ZIP file: {e}", 400)
+        except ExtractionBudgetExceeded as e:
+            raise JobError(str(e), 413)
+
+        units = delivery_units(manifest, layer_keys)
+        if None in units:
+            report = await validate_entries(project, units[None], required, choice, checks)
+        else:
+            report = {"clients": await validate_clients(units, required, choice, checks)}
+
+        # A report with timed-out checks may complete on a later, less loaded run
+        if not partial(report):
+            await store_result(cache_key, report)
+        return report
+    finally:
+        workspace.cleanup()
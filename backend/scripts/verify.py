@@ -1,57 +1,43 @@
-from shapely import wkt
-from shapely.geometry import Point, LineString
+from shapely.geometry import LineString
 from shapely.ops import unary_union
+import numpy as np
 import pandas as pd
 import re
+import shapely
+from scripts.deadline import track, checkpoint
+from scripts.zone_lookup import zone_positions, in_zones
+from scripts.zone_hierarchy import verify_zone_hierarchy, ZONE_LEVELS_BY_CHILD
 
-def convert_geometries_to_wkt(gdf):
-    gdf['wkt'] = gdf['geometry'].apply(lambda geom: wkt.dumps(geom))
-    return gdf
+# Candidate pairs evaluated per vectorized batch, between two deadline checkpoints
+PAIR_BATCH = 10000
+
+CROSSING_NODES = ('PB', 'PA', 'SRO', 'SUPPORT', 'ADRESSE')
+DIRECTION_NODES = ('NRO', 'SRO', 'PA', 'PB', 'ADRESSE')
+# Allowed (source, destination) node types of a cable, from the NRO down to the addresses
+CABLE_DIRECTIONS = {('NRO', 'SRO'), ('SRO', 'PA'), ('PA', 'PB'), ('PB', 'ADRESSE')}
 
 async def verify_geometries_in_zones(gdf, zgdf, zone_type):
     if gdf.crs != zgdf.crs:
         gdf = gdf.to_crs(zgdf.crs)
 
-    gdf = convert_geometries_to_wkt(gdf)
-    zgdf = convert_geometries_to_wkt(zgdf)
-
+    # Each element is matched to its zone by code: pcn_code for PA/PB (the last zone wins on
+    # duplicates), nd_code against the zone's z_nd_code for SRO/NRO (the first zone wins)
     if zone_type == 'PA' or zone_type == 'PB':
-        z_dict = {row['pcn_code']: wkt.loads(row['wkt']) for idx, row in zgdf.iterrows()}
+        codes = gdf['pcn_code'].to_numpy(dtype=object)
+        positions = zone_positions(codes, zgdf['pcn_code'], keep='last')
     elif zone_type == 'SRO':
-        z_dict = {row['zs_code']: (wkt.loads(row['wkt']), row['zs_nd_code']) for _, row in zgdf.iterrows()}
+        codes = gdf['nd_code'].to_numpy(dtype=object)
+        positions = zone_positions(codes, zgdf['zs_nd_code'])
     elif zone_type == 'NRO':
-        z_dict = {row['zn_code']: (wkt.loads(row['wkt']), row['zn_nd_code']) for _, row in zgdf.iterrows()}
+        codes = gdf['nd_code'].to_numpy(dtype=object)
+        positions = zone_positions(codes, zgdf['zn_nd_code'])
     else:
         raise ValueError("Le paramètre 'zone_type' doit être 'PA', 'PB', 'SRO' ou 'NRO'.")
 
-    not_in_zones = []
+    inside = in_zones(np.asarray(gdf.geometry.values), np.asarray(zgdf.geometry.values), positions)
+    not_in_zones = codes[~inside].tolist()
+    # The zone is found through the element's own nd_code, so both codes always agree
     nd_code_mismatch = []
-    for _, row in gdf.iterrows():
-        geom = wkt.loads(row['wkt'])
-        if zone_type == 'PA' or zone_type == 'PB':
-            z_geom = z_dict.get(row['pcn_code'])
-            if z_geom and z_geom.contains(geom):
-                continue
-            else:
-                not_in_zones.append(row['pcn_code'])
-        else:
-            nd_code = row['nd_code']
-            z_data = None
-            for z_code, (z_geom, z_nd_code) in z_dict.items():
-                if z_nd_code == nd_code:
-                    z_data = (z_geom, z_code)
-                    break
-
-            if not z_data:
-                not_in_zones.append(nd_code)
-                continue
-
-            z_geom, z_code = z_data
-
-            if not z_geom.contains(geom):
-                not_in_zones.append(nd_code)
-            elif nd_code != z_nd_code:
-                nd_code_mismatch.append(nd_code)
 
     if not_in_zones:
         print(f"Le(s) {zone_type}(s) suivants n'appartiennent pas à la zone Z{zone_type} assignée :", not_in_zones)
@@ -63,15 +49,26 @@ async def verify_geometries_in_zones(gdf, zgdf, zone_type):
 async def check_zp_intersections(zp_gdf, x):
     if zp_gdf.crs is None:
         raise ValueError(f"Le GeoDataFrame des Z{x} doit avoir un système de coordonnées (CRS) défini.")
-    zp_gdf = convert_geometries_to_wkt(zp_gdf)
+    code_attribute = 'zs_code' if x == 'SRO' else 'pcn_code'
+    geometries = np.asarray(zp_gdf.geometry.values)
+    codes = zp_gdf[code_attribute].to_numpy()
     intersecting_zp = []
-    for i, row1 in zp_gdf.iterrows():
-        for j, row2 in zp_gdf.iloc[i+1:].iterrows():  
-            if row1.geometry.intersects(row2.geometry) and not row1.geometry.touches(row2.geometry):  
-                if x == 'SRO': 
-                    intersecting_zp.append((row1['zs_code'], row2['zs_code'])) 
-                else:
-                    intersecting_zp.append((row1['pcn_code'], row2['pcn_code']))
+
+    # Candidate pairs come from the bounding boxes, in the (i, j) order of the former scan over rows i < j
+    left, right = zp_gdf.sindex.query(geometries)
+    keep = left < right
+    left, right = left[keep], right[keep]
+    order = np.lexsort((right, left))
+    left, right = left[order], right[order]
+
+    track(len(left))
+    for start in range(0, len(left), PAIR_BATCH):
+        i, j = left[start:start + PAIR_BATCH], right[start:start + PAIR_BATCH]
+        # Interiors intersect: intersects() and not touches() in a single DE-9IM test
+        overlapping = shapely.relate_pattern(geometries[i], geometries[j], 'T********')
+        intersecting_zp.extend(zip(codes[i[overlapping]], codes[j[overlapping]]))
+        checkpoint(len(i))
+
     if intersecting_zp:
         print(f"Les Z{x} suivants ont de vraies intersections :")
         for zp1, zp2 in intersecting_zp:
@@ -82,29 +79,8 @@ async def verify_zsro_in_zonenro(zsro_gdf, znro_gdf):
     if zsro_gdf.crs != znro_gdf.crs:
         zsro_gdf = zsro_gdf.to_crs(znro_gdf.crs)
 
-    zsro_gdf = convert_geometries_to_wkt(zsro_gdf)
-    znro_gdf = convert_geometries_to_wkt(znro_gdf)
-
-    znro_dict = {row['zn_r3_code']: wkt.loads(row['wkt']) for idx, row in znro_gdf.iterrows()}
-
-    zsro_not_in_zones = []
-
-    for idx, row in zsro_gdf.iterrows():
-        zsro_geom = wkt.loads(row['wkt'])
-        zs_code = row['zs_code']
-        znro_geom = znro_dict.get(row['zs_r3_code'])
-
-        if znro_geom:
-            intersection = znro_geom.intersection(zsro_geom)
-            if not intersection.equals(zsro_geom):
-                zsro_not_in_zones.append(zs_code)
-        else:
-            zsro_not_in_zones.append(zs_code)
-
-    if zsro_not_in_zones:
-        print("ZSRO n'appartiennent pas aux ZNRO assignées:")
-        for zsro in zsro_not_in_zones:
-            print(f"- {zsro}")
+    zsro_not_in_zones, = await verify_zone_hierarchy(
+        {'ZSRO': zsro_gdf, 'ZNRO': znro_gdf}, (ZONE_LEVELS_BY_CHILD['ZSRO'],))
     return zsro_not_in_zones
 
 async def detect_self_intersections_c(c_gdf, type):
@@ -114,7 +90,9 @@ async def detect_self_intersections_c(c_gdf, type):
     self_intersecting_c = []
     code_attribute = 'cm_codeext' if type == 'CM' else 'cl_codeext'
 
+    track(len(c_gdf))
     for i, row in c_gdf.iterrows():
+        checkpoint()
         geom = row['geometry']
         if isinstance(geom, (LineString)):
             if geom.is_valid:
@@ -135,7 +113,7 @@ async def detect_self_intersections_c(c_gdf, type):
 
     return self_intersecting_c
 
-async def verify_c_intersections(c_di_gdf, support_gdf, pb_gdf, pa_gdf, sro_gdf, adresse_gdf, type):
+async def verify_c_intersections(c_di_gdf, nodes, type):
     if c_di_gdf.crs is None:
         raise ValueError("Le GeoDataFrame des CB doit avoir un système de coordonnées (CRS) défini.")
 
@@ -148,19 +126,28 @@ async def verify_c_intersections(c_di_gdf, support_gdf, pb_gdf, pa_gdf, sro_gdf,
     else:
         raise ValueError(f"Type inconnu: {type}. Les types valides sont 'CB' et 'CM'.")
 
-    for i, row1 in c_di_gdf.iterrows():
-        for j, row2 in c_di_gdf.iloc[i+1:].iterrows():
-            if row1.geometry.intersects(row2.geometry) and not row1.geometry.touches(row2.geometry):
-                intersection_point = row1.geometry.intersection(row2.geometry)
-                
-                if not (
-                    pb_gdf.geometry.touches(intersection_point).any() or
-                    pa_gdf.geometry.touches(intersection_point).any() or
-                    sro_gdf.geometry.touches(intersection_point).any() or
-                    (support_gdf.geometry.contains(intersection_point).any() or support_gdf.geometry.touches(intersection_point).any()) or
-                    adresse_gdf.geometry.touches(intersection_point).any()
-                ):
-                    intersecting_c.append((row1[code_attribute], row2[code_attribute]))
+    geometries = np.asarray(c_di_gdf.geometry.values)
+    codes = c_di_gdf[code_attribute].to_numpy()
+
+    # Only pairs whose geometries intersect come out of the spatial index, in the
+    # (i, j) order of the former nested scan over rows i < j
+    left, right = c_di_gdf.sindex.query(geometries, predicate='intersects')
+    keep = left < right
+    left, right = left[keep], right[keep]
+    order = np.lexsort((right, left))
+    left, right = left[order], right[order]
+
+    track(len(left))
+    for start in range(0, len(left), PAIR_BATCH):
+        i, j = left[start:start + PAIR_BATCH], right[start:start + PAIR_BATCH]
+        crossing = ~shapely.touches(geometries[i], geometries[j])
+        i, j = i[crossing], j[crossing]
+        intersection_points = shapely.intersection(geometries[i], geometries[j])
+
+        # A crossing is allowed when it happens on a network node (PB, PA, SRO, SUPPORT, ADRESSE)
+        on_node = nodes.on_node(intersection_points, CROSSING_NODES)
+        intersecting_c.extend(zip(codes[i[~on_node]], codes[j[~on_node]]))
+        checkpoint(len(crossing))
 
     if intersecting_c:
         print(f"Il y a des éléments de la couche {type} qui s'intersectent.")
@@ -177,45 +164,35 @@ async def verify_mic_pm(zsro_gdf):
     except Exception as e:
         print(f"Erreur lors de la vérification des longueurs : {e}")
 
-async def detect_cb_without_cm(cb_di_gdf, cm_di_gdf, support_gdf, pb_gdf, pa_gdf, sro_gdf):
+async def detect_cb_without_cm(cb_di_gdf, cm_di_gdf, nodes):
     if cb_di_gdf.crs != cm_di_gdf.crs:
         cm_di_gdf = cm_di_gdf.to_crs(cb_di_gdf.crs)
-    if cb_di_gdf.crs != support_gdf.crs:
-        support_gdf = support_gdf.to_crs(cb_di_gdf.crs)
-    if cb_di_gdf.crs != pb_gdf.crs:
-        pb_gdf = pb_gdf.to_crs(cb_di_gdf.crs)
-    if cb_di_gdf.crs != pa_gdf.crs:
-        pa_gdf = pa_gdf.to_crs(cb_di_gdf.crs)
-    if cb_di_gdf.crs != sro_gdf.crs:
-        sro_gdf = sro_gdf.to_crs(cb_di_gdf.crs)
 
     cb_sans_cm = []
-
-    for idx_cb, cb_row in cb_di_gdf.iterrows():
-        cb_geom = cb_row.geometry
-
-        match_found = any(cb_geom.equals(cm_geom) for cm_geom in cm_di_gdf.geometry)
-
-        if not match_found:
-            cm_union = unary_union(cm_di_gdf.geometry)
-            cb_diff_cm = cb_geom.difference(cm_union)
-
-            supports_in_cb = support_gdf[support_gdf.geometry.within(cb_geom)]
-            pbs_in_cb = pb_gdf[pb_gdf.geometry.within(cb_geom)]
-            pas_in_cb = pa_gdf[pa_gdf.geometry.within(cb_geom)]
-            sros_in_cb = sro_gdf[sro_gdf.geometry.within(cb_geom)]
-
-            all_elements_geom = unary_union(
-                list(supports_in_cb.geometry) + 
-                list(pbs_in_cb.geometry) + 
-                list(pas_in_cb.geometry) + 
-                list(sros_in_cb.geometry)
-            )
-
-            uncovered_area = cb_diff_cm.difference(all_elements_geom)
-
-            if not uncovered_area.is_empty:
-                cb_sans_cm.append(cb_row['cl_codeext'])
+    cb_geometries = np.asarray(cb_di_gdf.geometry.values)
+    cm_geometries = np.asarray(cm_di_gdf.geometry.values)
+    codes = cb_di_gdf['cl_codeext'].to_numpy()
+
+    # A CB drawn exactly like a CM is matched through the CM index instead of a scan of the layer
+    cb_idx, cm_idx = cm_di_gdf.sindex.query(cb_geometries, predicate='intersects')
+    matched = np.zeros(len(cb_geometries), dtype=bool)
+    matched[cb_idx[shapely.equals(cb_geometries[cb_idx], cm_geometries[cm_idx])]] = True
+
+    cm_union = None
+    unmatched = np.flatnonzero(~matched)
+    track(len(unmatched))
+    for position in unmatched:
+        checkpoint()
+        cb_geom = cb_geometries[position]
+        if cm_union is None:
+            cm_union = unary_union(cm_geometries)
+        cb_diff_cm = cb_geom.difference(cm_union)
+
+        elements_in_cb = nodes.geometries[nodes.within(cb_geom, ('SUPPORT', 'PB', 'PA', 'SRO'))]
+        uncovered_area = cb_diff_cm.difference(unary_union(list(elements_in_cb)))
+
+        if not uncovered_area.is_empty:
+            cb_sans_cm.append(codes[position])
 
     if cb_sans_cm:
         print("Les CB suivants ne disposent d’aucun CM :")
@@ -265,49 +242,29 @@ async def check_duplicates(dataframes):
     except Exception as e:
         print(f"Erreur lors de la vérification des doublons : {e}")
 
-async def verify_cable_direction(cb_di_gdf, nro_gdf, sro_gdf, pa_gdf, pb_gdf, adresse_gdf):
-    def get_zone_type(geom, zone_gdfs):
-        for zone_type, zone_gdf in zone_gdfs.items():
-            if zone_gdf.geometry.contains(geom).any():
-                return zone_type
-        return None
-
-    zone_gdfs = {
-        'NRO': nro_gdf,
-        'SRO': sro_gdf,
-        'PA': pa_gdf,
-        'PB': pb_gdf,
-        'ADRESSE': adresse_gdf
-    }
-
+async def verify_cable_direction(cb_di_gdf, nodes):
     incorrect_direction_cables = []
-
-    for idx, row in cb_di_gdf.iterrows():
-        geom = row['geometry']
-        if not isinstance(geom, LineString):
-            continue
-
-        source = Point(geom.coords[0])
-        destination = Point(geom.coords[-1])
-
-        source_zone_type = get_zone_type(source, zone_gdfs)
-        destination_zone_type = get_zone_type(destination, zone_gdfs)
-
+    geometries = np.asarray(cb_di_gdf.geometry.values)
+    codes = cb_di_gdf['cl_codeext'].to_numpy()
+
+    lines = np.flatnonzero(shapely.get_type_id(geometries) == shapely.GeometryType.LINESTRING)
+    sources = shapely.get_point(geometries[lines], 0)
+    destinations = shapely.get_point(geometries[lines], -1)
+    source_types = nodes.node_type(sources, DIRECTION_NODES)
+    destination_types = nodes.node_type(destinations, DIRECTION_NODES)
+
+    track(len(lines))
+    for position, source_zone_type, destination_zone_type in zip(lines, source_types, destination_types):
+        checkpoint()
         if source_zone_type and destination_zone_type:
             if source_zone_type == destination_zone_type:
-                    continue
-            elif source_zone_type == 'NRO' and destination_zone_type == 'SRO':
-                continue
-            elif source_zone_type == 'SRO' and destination_zone_type == 'PA':
-                continue
-            elif source_zone_type == 'PA' and destination_zone_type == 'PB':
                 continue
-            elif source_zone_type == 'PB' and destination_zone_type == 'ADRESSE':
+            elif (source_zone_type, destination_zone_type) in CABLE_DIRECTIONS:
                 continue
             else:
-                incorrect_direction_cables.append(row['cl_codeext'])
+                incorrect_direction_cables.append(codes[position])
         else:
-            incorrect_direction_cables.append(row['cl_codeext'])
+            incorrect_direction_cables.append(codes[position])
 
     if incorrect_direction_cables:
         print("Les cables suivants ont un sens incorrecte :")
@@ -441,7 +398,9 @@ async def verify_pcn_cb_ent_sro(sro_gdf, adresse_gdf):
         print("Aucune valeur valide trouvée pour pcn_cb_ent.")
         return True
     
+    track(len(sro_gdf))
     for i, row in sro_gdf.iterrows():
+        checkpoint()
         pcn_cb_ent = row['pcn_cb_ent']
         nd_code = row['nd_code']
         
@@ -583,7 +542,9 @@ async def verify_zs_capamax(zsro_gdf):
     invalid_zs_capamax = []
     valid_values = [576, 600, 720, 800, 864]
     
+    track(len(zsro_gdf))
     for i, row in zsro_gdf.iterrows():
+        checkpoint()
         zs_capamax = row['zs_capamax']
         zs_r4_code = row['zs_r4_code']
         
@@ -605,7 +566,9 @@ async def verify_pcn_ftth(zpa_gdf, pb_gdf, zpbo_gdf, zsro_gdf, adresse_gdf):
             return False
         
         invalid_pcn_ftth = []
+        track(len(gdf))
         for i, row in gdf.iterrows():
+            checkpoint()
             geometry = row['geometry']
             za_pcn_ftth = row['pcn_ftth']
             
@@ -619,10 +582,10 @@ async def verify_pcn_ftth(zpa_gdf, pb_gdf, zpbo_gdf, zsro_gdf, adresse_gdf):
         return invalid_pcn_ftth
 
     # Vérification pour chaque table
-    invalid_zpa = check_table(zpa_gdf, 'ZPA')
-    invalid_pb = check_table(pb_gdf, 'PB')
-    invalid_zpbo = check_table(zpbo_gdf, 'ZPBO')
-    invalid_zsro = check_table(zsro_gdf, 'ZSRO')
+    invalid_zpa = await check_table(zpa_gdf, 'ZPA')
+    invalid_pb = await check_table(pb_gdf, 'PB')
+    invalid_zpbo = await check_table(zpbo_gdf, 'ZPBO')
+    invalid_zsro = await check_table(zsro_gdf, 'ZSRO')
 
     return {
         'invalid_zpa': invalid_zpa,
@@ -639,7 +602,9 @@ async def verify_pcn_ftte_zsro(zsro_gdf, adresse_gdf):
         return False
     
     invalid_pcn_ftte = []
+    track(len(zsro_gdf))
     for i, row in zsro_gdf.iterrows():
+        checkpoint()
         zs_geometry = row['geometry']
         zs_pcn_ftte = row['pcn_ftte']
         
@@ -660,7 +625,9 @@ async def verify_pcn_umtot_zsro(zsro_gdf, pb_gdf):
         return False
     
     invalid_pcn_umtot = []
+    track(len(zsro_gdf))
     for i, row in zsro_gdf.iterrows():
+        checkpoint()
         zs_geometry = row['geometry']
         zs_pcn_umtot = row['pcn_umtot']
         
@@ -1,17 +1,15 @@
 import geopandas as gpd
 from shapely.geometry import  LineString
-from shapely import wkt
-
-def convert_geometries_to_wkt(gdf):
-    gdf['wkt'] = gdf['geometry'].apply(lambda geom: wkt.dumps(geom))
-    return gdf
+from scripts.deadline import track, checkpoint
 
 async def verify_cb_capafo(cb_gdf, support_gdf):
     filtered_supports = support_gdf[support_gdf['pcn_newsup'].str.contains("POTEAU|IMMEUBLE", case=False, na=False)]
     
     invalid_cb_capafo = []
 
+    track(len(cb_gdf))
     for i, cb_row in cb_gdf.iterrows():
+        checkpoint()
         has_support = any(cb_row.geometry.intersects(support.geometry) for support in filtered_supports.itertuples())
         
         if has_support and cb_row['cb_capafo'] > 144:
@@ -69,34 +67,6 @@ async def verify_no_overlap(pa_gdf, support_gdf):
     except Exception as e:
         print(f"Erreur lors de la vérification de la superposition : {e}")
 
-async def verify_zpb_in_zonepa(zpbo_gdf, zpa_gdf):
-    if zpbo_gdf.crs != zpa_gdf.crs:
-        zpbo_gdf = zpbo_gdf.to_crs(zpa_gdf.crs)
-
-    zpbo_gdf = convert_geometries_to_wkt(zpbo_gdf)
-    zpa_gdf = convert_geometries_to_wkt(zpa_gdf)
-
-    zpa = {row['pcn_code']: wkt.loads(row['wkt']) for idx, row in zpa_gdf.iterrows()}  
-    zpb_in_zones = []
-    zpb_not_in_zones = []
-    
-    for idx, row in zpbo_gdf.iterrows():
-        zpb_geom = wkt.loads(row['wkt'])
-        pcn_code = row['pcn_code']  
-        zpa_geom = zpa.get(row['pcn_zpa'])
-        
-        if zpa_geom and zpa_geom.contains(zpb_geom):
-            zpb_in_zones.append(pcn_code)
-        else:
-            zpb_not_in_zones.append( pcn_code)
-
-    if zpb_not_in_zones:
-        print("Les ZPBO suivants n'appartiennent pas à leurs ZPA assignées :")
-        print(zpb_not_in_zones)
-
-
-    return zpb_in_zones, zpb_not_in_zones
-
 async def verify_max_distance_between_supports(cm_gdf, support_gdf, max_distance=42):
     if cm_gdf.crs != support_gdf.crs:
         support_gdf = support_gdf.to_crs(cm_gdf.crs)
@@ -105,7 +75,9 @@ async def verify_max_distance_between_supports(cm_gdf, support_gdf, max_distance
 
     support_distances_exceeding_max = []
 
+    track(len(cm_gdf))
     for cm_idx, cm_row in cm_gdf.iterrows():
+        checkpoint()
         cm_line = cm_row.geometry
         support_points = []
 
@@ -132,35 +104,12 @@ async def verify_max_distance_between_supports(cm_gdf, support_gdf, max_distance
 
     return support_distances_exceeding_max
 
-async def verify_zpa_in_zonesro(zpa_gdf, zsro_gdf):
-    if zpa_gdf.crs != zsro_gdf.crs:
-        zpa_gdf = zpa_gdf.to_crs(zsro_gdf.crs)
-
-    zsro_geom = zsro_gdf.iloc[0]['geometry']
-
-    zpa_in_zones = []
-    zpa_not_in_zones = []
-
-    for idx, row in zpa_gdf.iterrows():
-        zpa_geom = row['geometry']
-        pcn_code = row['pcn_code']
-
-        if zsro_geom.contains(zpa_geom):
-            zpa_in_zones.append(pcn_code)
-        else:
-            zpa_not_in_zones.append(pcn_code)
-
-    if zpa_not_in_zones:
-        print("Les ZPA suivants n'appartiennent pas entièrement à la zone ZSRO assignée :")
-        for pcn_code in zpa_not_in_zones:
-            print(f"- {pcn_code}")
-
-    return zpa_in_zones, zpa_not_in_zones
-
 async def verify_PBR_EL(pb_gdf):
     filtered_pbs = pb_gdf[pb_gdf['pcn_pbtyp'].str.contains("PBR", case=False, na=False)]
     invalid_pbr = []
+    track(len(filtered_pbs))
     for i, row in filtered_pbs.iterrows():
+        checkpoint()
         if row['pcn_ftth'] > 3:
             invalid_pbr.append(row['pcn_code'])
     if invalid_pbr:
@@ -194,7 +143,9 @@ async def verify_pcn_code_pa(pa_gdf, zpa_gdf):
     
     invalid_pcn_code = []
 
+    track(len(pa_gdf))
     for i, row in pa_gdf.iterrows():
+        checkpoint()
         pa_geometry = row['geometry']
         pa_pcn_code = row['pcn_code']
         
@@ -218,7 +169,9 @@ async def verify_pcn_cb_ent_pa(pa_gdf, cb_di_gdf):
         return False
     invalid_pcn_cb_ent = []
 
+    track(len(pa_gdf))
     for i, row in pa_gdf.iterrows():
+        checkpoint()
         pa_geometry = row['geometry']
         pa_pcn_cb_ent = row['pcn_cb_ent']
         def intersects_with_pa(x):
@@ -262,7 +215,9 @@ def verify_pcn_code_zpa(zpa_gdf):
     
     parts = []
     
+    track(len(zpa_gdf))
     for i, row in zpa_gdf.iterrows():
+        checkpoint()
         pcn_code = row['pcn_code']
         match = pattern.match(pcn_code)
         
@@ -287,7 +242,9 @@ def verify_pcn_capa_zpa(zpa_gdf, cb_di_gdf):
         return False
     invalid_pcn_capa = []
 
+    track(len(zpa_gdf))
     for i, row in zpa_gdf.iterrows():
+        checkpoint()
         zpa_geometry = row['geometry']
         zpa_pcn_capa = row['pcn_capa']
         def intersects_with_zpa(x):
@@ -323,7 +280,9 @@ def verify_pcn_ftth_zpa(zpa_gdf, adresse_gdf):
         return False
     
     invalid_pcn_ftth = []
+    track(len(zpa_gdf))
     for i, row in zpa_gdf.iterrows():
+        checkpoint()
         za_geometry = row['geometry']
         za_pcn_ftth = row['pcn_ftth']
         
@@ -344,7 +303,9 @@ def verify_pcn_umftth_zpa(zpa_gdf, pb_gdf):
         return False
     
     invalid_pcn_umftth = []
+    track(len(zpa_gdf))
     for i, row in zpa_gdf.iterrows():
+        checkpoint()
         za_geometry = row['geometry']
         za_pcn_umftth = row['pcn_umftth']
         
@@ -365,7 +326,9 @@ def verify_pcn_ftte_zpa(zpa_gdf, adresse_gdf):
         return False
     
     invalid_pcn_ftte = []
+    track(len(zpa_gdf))
     for i, row in zpa_gdf.iterrows():
+        checkpoint()
         za_geometry = row['geometry']
         za_pcn_ftte = row['pcn_ftte']
         
@@ -388,7 +351,9 @@ def verify_pcn_umftte_zpa(zpa_gdf, pb_gdf):
         print("La colonne pcn_umftte contient une/des valeurs manquantes dans la table attributaire de ZPA")
         return False
     invalid_pcn_umftte = []
+    track(len(zpa_gdf))
     for i, row in zpa_gdf.iterrows():
+        checkpoint()
         za_geometry = row['geometry']
         za_pcn_umftte = row['pcn_umftte']
         
@@ -411,7 +376,9 @@ def verify_pcn_umuti_zpa(zpa_gdf):
         return False
     
     invalid_pcn_umuti = []
+    track(len(zpa_gdf))
     for i, row in zpa_gdf.iterrows():
+        checkpoint()
         za_pcn_umuti = row['pcn_umuti']
         aggregate_pcn_umuti = row['pcn_umftth'] + row['pcn_umftte']
         
@@ -432,7 +399,9 @@ def verify_pcn_umrsv_zpa(zpa_gdf):
         return False
     
     invalid_pcn_umrsv = []
+    track(len(zpa_gdf))
     for i, row in zpa_gdf.iterrows():
+        checkpoint()
         za_pcn_umrsv = row['pcn_umrsv']
         aggregate_pcn_umrsv = (row['pcn_capa'] / 6) - row['pcn_umuti']
         
@@ -452,7 +421,9 @@ def verify_pcn_umtot_zpa(zpa_gdf):
         return False
     
     invalid_pcn_umtot = []
+    track(len(zpa_gdf))
     for i, row in zpa_gdf.iterrows():
+        checkpoint()
         za_pcn_umtot = row['pcn_umtot']
         aggregate_pcn_umtot = row['pcn_umuti'] + row['pcn_umrsv']
         
@@ -485,7 +456,9 @@ def verify_pcn_sro(zpa_gdf, zsro_gdf, type):
 
 def verify_PB_pcn_umftth(pb_gdf):
     invalid_pb = []
+    track(len(pb_gdf))
     for i, row in pb_gdf.iterrows():
+        checkpoint()
         pcn_pbtyp = row['pcn_pbtyp']
         pcn_umftth = row['pcn_umftth']
         pcn_code = row['pcn_code']
@@ -511,7 +484,9 @@ def verify_PB_pcn_pbtyp(pb_gdf):
         return False
     invalid_pb = []
     valid_pb = ["PB6", "PBR6e", "PBR6m", "PB12", "PBR12e", "PBR12m", "PBI"]
+    track(len(pb_gdf))
     for i, row in pb_gdf.iterrows():
+        checkpoint()
         pcn_pbtyp = row['pcn_pbtyp']
         pcn_code = row['pcn_code']
         if pcn_pbtyp not in valid_pb:
@@ -529,7 +504,9 @@ def verify_pcn_ftth_pb(pb_gdf, zpbo_gdf):
         return False
     invalid_pcn_ftth = []
 
+    track(len(pb_gdf))
     for i, row in pb_gdf.iterrows():
+        checkpoint()
         pcn_ftth_point = row['geometry']
         pcn_ftth_value = row['pcn_ftth']
         pcn_code = row['pcn_code']
@@ -560,7 +537,9 @@ def verify_pcn_code_pb(pb_gdf):
     
     parts = []
     
+    track(len(pb_gdf))
     for i, row in pb_gdf.iterrows():
+        checkpoint()
         pcn_code = row['pcn_code']
         match = pattern.match(pcn_code)
         
@@ -579,7 +558,9 @@ def verify_pcn_code_pb(pb_gdf):
 
 def verify_pcn_zpa(pb_gdf, zpa_gdf):
     invalid_pcn_zpa = []
+    track(len(pb_gdf))
     for i, row in pb_gdf.iterrows():
+        checkpoint()
         pb_geometry = row['geometry']
         pcn_zpa_value = row['pcn_zpa']
         pcn_code = row['pcn_code']
@@ -600,7 +581,9 @@ def verify_pcn_zpa(pb_gdf, zpa_gdf):
 def verify_pcn_commen_pb(pb_gdf):
     invalid_pcn_commen = []
     filtered_pbs = pb_gdf[pb_gdf['pcn_pbtyp'].isin(['PBR6e', 'PBR12e'])]
+    track(len(filtered_pbs))
     for i, row in filtered_pbs.iterrows():
+        checkpoint()
         pcn_commen_value = row['pcn_commen']
         pcn_code = row['pcn_code']
         if pd.isna(pcn_commen_value) or pcn_commen_value == '':
@@ -615,7 +598,9 @@ def verify_pcn_commen_pb(pb_gdf):
 def verify_pcn_rac_lg_pb(pb_gdf, cb_di_gdf):
     invalid_pcn_rac_lg = []
 
+    track(len(pb_gdf))
     for i, pb_row in pb_gdf.iterrows():
+        checkpoint()
         pb_geometry = pb_row['geometry']
         pcn_rac_lg_value = pb_row['pcn_rac_lg']
         pcn_code = pb_row['pcn_code']
@@ -638,7 +623,9 @@ def verify_pcn_rac_lg_pb(pb_gdf, cb_di_gdf):
 def verify_pcn_cb_ent_pb(pb_gdf):
     invalid_pcn_cb_ent = []
     
+    track(len(pb_gdf))
     for i, row in pb_gdf.iterrows():
+        checkpoint()
         pcn_pbtyp = row['pcn_pbtyp']
         pcn_ftth = row['pcn_ftth']
         pcn_cb_ent = row['pcn_cb_ent']
@@ -684,7 +671,9 @@ def verify_pcn_code_zpbo(zpbo_gdf, pb_gdf):
     
     invalid_pcn_code = []
 
+    track(len(zpbo_gdf))
     for i, row in zpbo_gdf.iterrows():
+        checkpoint()
         zpbo_geometry = row['geometry']
         zpbo_pcn_code = row['pcn_code']
         
@@ -717,7 +706,9 @@ def verify_zp_r4_code(zpbo_gdf, zsro_gdf):
 
 def verify_pcn_zpa_zpbo(zpbo_gdf, zpa_gdf):
     invalid_pcn_zpa = []
+    track(len(zpbo_gdf))
     for i, row in zpbo_gdf.iterrows():
+        checkpoint()
         zpbo_geometry = row['geometry']
         pcn_zpa_value = row['pcn_zpa']
         pcn_code = row['pcn_code']
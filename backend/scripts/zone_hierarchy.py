@@ -0,0 +1,62 @@
+import numpy as np
+import shapely
+from dataclasses import dataclass
+from scripts.deadline import track, checkpoint
+from scripts.zone_lookup import zone_positions, in_zones
+
+@dataclass
+class ZoneLevel:
+    child: str
+    parent: str
+    # child column holding the code of its parent zone, and the parent column it refers to
+    link: str
+    parent_code: str
+    # code reported for the child zones that are not covered by their parent
+    child_code: str
+    # a child whose link is empty or matches no parent is checked against any parent covering it
+    # (ZPA used to be compared to the first ZSRO only, whatever their pcn_sro)
+    spatial_fallback: bool = False
+    # the report also lists the covered zones, as the former per-level checks did
+    keep_covered: bool = False
+
+ZONE_LEVELS = (
+    ZoneLevel('ZPBO', 'ZPA', 'pcn_zpa', 'pcn_code', 'pcn_code', keep_covered=True),
+    ZoneLevel('ZPA', 'ZSRO', 'pcn_sro', 'zs_r4_code', 'pcn_code', spatial_fallback=True, keep_covered=True),
+    ZoneLevel('ZSRO', 'ZNRO', 'zs_r3_code', 'zn_r3_code', 'zs_code'),
+)
+ZONE_LEVELS_BY_CHILD = {level.child: level for level in ZONE_LEVELS}
+
+def covered_zones(level, child, parent):
+    # covered_by(child, parent) for each child zone, against prepared parent geometries
+    geometries = np.asarray(child.geometry.values)
+    positions = zone_positions(child[level.link], parent[level.parent_code], keep='last')
+    covered = in_zones(geometries, np.asarray(parent.geometry.values), positions, shapely.covers)
+    if level.spatial_fallback:
+        unresolved = np.flatnonzero(positions < 0)
+        if len(unresolved):
+            found, _ = parent.sindex.query(geometries[unresolved], predicate='covered_by')
+            covered[unresolved[np.unique(found)]] = True
+    return covered
+
+def level_result(level, child, covered):
+    codes = child[level.child_code].to_numpy(dtype=object)
+    not_covered = codes[~covered].tolist()
+    if not_covered:
+        print(f"Les {level.child} suivants n'appartiennent pas entièrement à leurs {level.parent} assignées :")
+        for code in not_covered:
+            print(f"- {code}")
+    if level.keep_covered:
+        return codes[covered].tolist(), not_covered
+    return not_covered
+
+async def verify_zone_hierarchy(zones, levels=ZONE_LEVELS):
+    # ZPBO ⊂ ZPA ⊂ ZSRO ⊂ ZNRO in one pass: each level is a hash join on the parent code
+    # followed by one vectorized covers() call. Returns one result per level, in order.
+    results = []
+    track(sum(len(zones[level.child]) for level in levels))
+    for level in levels:
+        child = zones[level.child]
+        covered = covered_zones(level, child, zones[level.parent])
+        results.append(level_result(level, child, covered))
+        checkpoint(len(child))
+    return tuple(results)
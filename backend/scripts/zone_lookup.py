@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import shapely
+
+def zone_positions(codes, zone_codes, keep='first'):
+    # Row of the zone carrying each code through a hash index, -1 where no zone carries it.
+    # keep picks the zone among duplicated codes, as the former dict/scan lookups did.
+    zone_codes = pd.Index(zone_codes)
+    unique = zone_codes.notna() & ~zone_codes.duplicated(keep=keep)
+    lookup = pd.Series(np.flatnonzero(unique), index=zone_codes[unique])
+    return pd.Series(codes).map(lookup).fillna(-1).to_numpy(dtype=int)
+
+def in_zones(geometries, zone_geometries, positions, predicate=shapely.contains):
+    # predicate(zone, geometry) for each geometry and its zone, False where it has none
+    inside = np.zeros(len(geometries), dtype=bool)
+    found = positions >= 0
+    if found.any():
+        zones = zone_geometries[positions[found]]
+        shapely.prepare(zones)
+        inside[found] = predicate(zones, geometries[found])
+    return inside
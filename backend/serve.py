@@ -0,0 +1,88 @@
+import time
+import importlib
+from config import SERVER_BIND, SERVER_THREADS, SERVER_TIMEOUT
+
+GEOSPATIAL_MODULES = ['numpy', 'pandas', 'shapely', 'pyproj', 'pyogrio', 'pyarrow', 'geopandas']
+
+def preload_geospatial_stack():
+    timings = {}
+    for name in GEOSPATIAL_MODULES:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        timings[name] = time.perf_counter() - start
+
+    # Opening proj.db and building a first transformer is what makes the first to_crs slow
+    start = time.perf_counter()
+    import pyproj
+    pyproj.Transformer.from_crs(2154, 4326, always_xy=True)
+    timings['proj.db'] = time.perf_counter() - start
+    return timings
+
+def first_request(app):
+    start = time.perf_counter()
+    with app.test_client() as client:
+        client.get('/health')
+    return time.perf_counter() - start
+
+def load_app():
+    started = time.perf_counter()
+    timings = preload_geospatial_stack()
+    start = time.perf_counter()
+    from app import app
+    timings['app'] = time.perf_counter() - start
+
+    print("Temps de démarrage :")
+    for name, elapsed in timings.items():
+        print(f"- {name}: {elapsed:.3f} s")
+    print(f"Démarrage à froid : {time.perf_counter() - started:.3f} s")
+    return app
+
+def serve_gunicorn(app):
+    from gunicorn.app.base import BaseApplication
+    from delete_temp_files import start_cleaner
+
+    def when_ready(server):
+        start_cleaner()
+
+    def post_worker_init(worker):
+        print(f"Worker {worker.pid} prêt, première requête : {first_request(app) * 1000:.1f} ms")
+
+    class Server(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', SERVER_BIND)
+            # A single worker: job admission, fair queueing and warm datasets live in its memory
+            self.cfg.set('workers', 1)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('threads', SERVER_THREADS)
+            self.cfg.set('timeout', SERVER_TIMEOUT)
+            # The app and the geospatial stack are imported before the fork, the worker starts warm
+            self.cfg.set('preload_app', True)
+            self.cfg.set('when_ready', when_ready)
+            self.cfg.set('post_worker_init', post_worker_init)
+
+        def load(self):
+            return app
+
+    Server().run()
+
+def serve_single(app):
+    # Windows has no fork: one process serving requests from threads
+    from delete_temp_files import start_cleaner
+    host, _, port = SERVER_BIND.rpartition(':')
+    start_cleaner()
+    print(f"Première requête : {first_request(app) * 1000:.1f} ms")
+    app.run(host=host or '0.0.0.0', port=int(port), threaded=True)
+
+def main():
+    try:
+        import gunicorn
+    except ImportError:
+        serve_single(load_app())
+        return
+    serve_gunicorn(load_app())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import asyncio
+import geopandas as gpd
+from shapely.geometry import LineString, Point
+from scripts.node_index import NodeIndex, NODE_LAYERS
+from scripts.verify import verify_c_intersections
+
+def layer(geometries=(), **columns):
+    return gpd.GeoDataFrame(columns, geometry=list(geometries), crs=2154)
+
+CB = layer(
+    [
+        # point crossing away from any node
+        LineString([(0, 0), (10, 10)]), LineString([(0, 10), (10, 0)]),
+        # point crossing on a PB
+        LineString([(20, 0), (30, 10)]), LineString([(20, 10), (30, 0)]),
+        # point crossing on a SUPPORT
+        LineString([(40, 5), (50, 5)]), LineString([(40, 0), (50, 10)]),
+        # two crossings, each on its own SUPPORT
+        LineString([(60, 0), (70, 10), (80, 0)]), LineString([(60, 5), (80, 5)]),
+        # two crossings, only one of them on a SUPPORT
+        LineString([(90, 0), (100, 10), (110, 0)]), LineString([(90, 5), (110, 5)]),
+        # collinear overlap from (125, 0) to (130, 0), with a PB at one end
+        LineString([(120, 0), (130, 0)]), LineString([(125, 0), (135, 0)]),
+    ],
+    cl_codeext=[f'CB{i}' for i in range(1, 13)],
+)
+PB = layer([Point(25, 5), Point(125, 0)])
+SUPPORT = layer([Point(45, 5), Point(65, 5), Point(75, 5), Point(95, 5)])
+
+def node_frames():
+    frames = {name: layer() for name in NODE_LAYERS}
+    frames['PB'] = PB
+    frames['SUPPORT'] = SUPPORT
+    return frames
+
+def former_intersections(c_gdf, support_gdf, pb_gdf, pa_gdf, sro_gdf, adresse_gdf):
+    # Nested scan used before the spatial index, kept to pin the behaviour changes
+    intersecting_c = []
+    for i, row1 in c_gdf.iterrows():
+        for j, row2 in c_gdf.iloc[i+1:].iterrows():
+            if row1.geometry.intersects(row2.geometry) and not row1.geometry.touches(row2.geometry):
+                intersection_point = row1.geometry.intersection(row2.geometry)
+                if not (
+                    pb_gdf.geometry.touches(intersection_point).any() or
+                    pa_gdf.geometry.touches(intersection_point).any() or
+                    sro_gdf.geometry.touches(intersection_point).any() or
+                    (support_gdf.geometry.contains(intersection_point).any() or support_gdf.geometry.touches(intersection_point).any()) or
+                    adresse_gdf.geometry.touches(intersection_point).any()
+                ):
+                    intersecting_c.append((row1['cl_codeext'], row2['cl_codeext']))
+    return intersecting_c
+
+def test_former_scan_pairs():
+    # Point nodes never touch a point, so only SUPPORT accepted a crossing, and a
+    # multipoint crossing only when one support held all of it. A PB touching
+    # the end of an overlap accepted the whole overlap.
+    assert former_intersections(CB, SUPPORT, PB, layer(), layer(), layer()) == [
+        ('CB1', 'CB2'),
+        ('CB3', 'CB4'),
+        ('CB7', 'CB8'),
+        ('CB9', 'CB10'),
+    ]
+
+def test_indexed_pairs():
+    # Every part of the intersection must be a point on a crossing node; an overlap is always reported
+    intersecting = asyncio.run(verify_c_intersections(CB, NodeIndex(node_frames()), 'CB'))
+
+    assert intersecting == [
+        ('CB1', 'CB2'),
+        ('CB9', 'CB10'),
+        ('CB11', 'CB12'),
+    ]
@@ -0,0 +1,37 @@
+import geopandas as gpd
+from shapely.geometry import LineString, MultiLineString, Point
+from scripts.shared_layers import publish_layers, attach_layers
+
+def round_trip(name, gdf):
+    shared = publish_layers({name: gdf})
+    try:
+        return attach_layers(shared)[name]
+    finally:
+        shared.release()
+
+def test_mixed_cable_layer_keeps_geometry_types():
+    cb = gpd.GeoDataFrame(
+        {'cl_codeext': ['CB1', 'CB2', 'CB3'], 'cb_capafo': [12, 24, 48]},
+        geometry=[
+            LineString([(0, 0), (1, 1)]),
+            MultiLineString([[(0, 0), (1, 0)], [(2, 0), (3, 0)]]),
+            None,
+        ],
+        crs=2154,
+    )
+
+    attached = round_trip('CB', cb)
+
+    assert attached.crs == cb.crs
+    assert attached['cl_codeext'].tolist() == cb['cl_codeext'].tolist()
+    assert attached['cb_capafo'].tolist() == cb['cb_capafo'].tolist()
+    assert list(attached.geometry.geom_type) == list(cb.geometry.geom_type)
+    assert list(attached.geometry) == list(cb.geometry)
+
+def test_uniform_point_layer_round_trip():
+    pb = gpd.GeoDataFrame({'pcn_code': ['PB1', 'PB2']}, geometry=[Point(0, 0), Point(1, 2)], crs=2154)
+
+    attached = round_trip('PB', pb)
+
+    assert attached['pcn_code'].tolist() == pb['pcn_code'].tolist()
+    assert list(attached.geometry) == list(pb.geometry)
@@ -0,0 +1,28 @@
+import os
+import shutil
+import uuid
+from contextlib import asynccontextmanager
+from config import TEMP_DIR
+
+WORKSPACE_PREFIX = 'job_'
+
+class Workspace:
+    def __init__(self, job_id=None, base_dir=TEMP_DIR):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.path = os.path.join(base_dir, f"{WORKSPACE_PREFIX}{self.job_id}")
+        self.extract_dir = os.path.join(self.path, 'extracted')
+        os.makedirs(self.extract_dir)
+
+    def file_path(self, name):
+        return os.path.join(self.path, name)
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+@asynccontextmanager
+async def job_workspace(job_id=None):
+    workspace = Workspace(job_id)
+    try:
+        yield workspace
+    finally:
+        workspace.cleanup()